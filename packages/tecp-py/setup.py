@@ -38,6 +38,12 @@ setup(
         "pydantic>=2.0.0",
     ],
     extras_require={
+        "nacl": [
+            "pynacl>=1.5.0",
+        ],
+        "blake3": [
+            "blake3>=0.3.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
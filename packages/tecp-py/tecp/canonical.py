@@ -0,0 +1,205 @@
+"""
+TECP Canonical CBOR
+
+Specialized canonical CBOR encoder for the fixed core receipt schema.
+Produces the same bytes as ``cbor2.dumps(core, canonical=True)`` without
+going through a general-purpose encoder.
+"""
+
+import struct
+from typing import Optional, Sequence, Union
+
+
+def _key_header(name: bytes) -> bytes:
+    """Encode a short map key as a CBOR text string"""
+    return bytes((0x60 | len(name),)) + name
+
+
+# Core keys in RFC 8949 canonical order (encoded length first, then bytewise)
+_CORE_KEY_ORDER = [
+    b"ts",
+    b"nonce",
+    b"pubkey",
+    b"version",
+    b"code_ref",
+    b"hash_alg",  # optional
+    b"input_hash",
+    b"policy_ids",
+    b"output_hash",
+]
+
+_MAP_HEADER = b"\xa8"  # map with 8 entries
+_MAP_HEADER_HASH_ALG = b"\xa9"  # map with 9 entries (hash_alg present)
+
+(
+    _KEY_TS,
+    _KEY_NONCE,
+    _KEY_PUBKEY,
+    _KEY_VERSION,
+    _KEY_CODE_REF,
+    _KEY_HASH_ALG,
+    _KEY_INPUT_HASH,
+    _KEY_POLICY_IDS,
+    _KEY_OUTPUT_HASH,
+) = [_key_header(k) for k in _CORE_KEY_ORDER]
+
+
+def _head(major: int, n: int) -> bytes:
+    """Encode a CBOR initial byte plus argument in its shortest form"""
+    if n < 24:
+        return bytes((major | n,))
+    if n < 0x100:
+        return struct.pack(">BB", major | 24, n)
+    if n < 0x10000:
+        return struct.pack(">BH", major | 25, n)
+    if n < 0x100000000:
+        return struct.pack(">BI", major | 26, n)
+    if n < 0x10000000000000000:
+        return struct.pack(">BQ", major | 27, n)
+    raise ValueError("Integer out of CBOR range")
+
+
+# Receipt fields are short and of fixed shape, so the generic encoder is
+# specialized ahead of time: string headers for every length below 256
+# come from a lookup table, and 64-bit timestamps use a precompiled
+# struct instead of going through _head.
+_TSTR_HEADERS = [_head(0x60, n) for n in range(256)]
+_BSTR_HEADERS = [_head(0x40, n) for n in range(256)]
+_UINT64 = struct.Struct(">BQ").pack
+
+
+def _enc_tstr(value: str) -> bytes:
+    """Encode a text string"""
+    if type(value) is not str:
+        raise TypeError(f"Expected str, got {type(value).__name__}")
+    raw = value.encode("utf-8")
+    n = len(raw)
+    return (_TSTR_HEADERS[n] if n < 256 else _head(0x60, n)) + raw
+
+
+def _enc_bstr(value: bytes) -> bytes:
+    """Encode a byte string"""
+    n = len(value)
+    return (_BSTR_HEADERS[n] if n < 256 else _head(0x40, n)) + value
+
+
+def _enc_binary(value: Union[str, bytes]) -> bytes:
+    """Encode a binary field: byte string when raw, text string when base64"""
+    if type(value) is bytes:
+        return _enc_bstr(value)
+    return _enc_tstr(value)
+
+
+def _enc_uint(value: int) -> bytes:
+    """Encode an integer (negative values use major type 1)"""
+    if type(value) is not int:
+        raise TypeError(f"Expected int, got {type(value).__name__}")
+    if 0x100000000 <= value < 0x10000000000000000:
+        return _UINT64(0x1B, value)  # every millisecond timestamp after 1970-02-19
+    if value < 0:
+        return _head(0x20, -1 - value)
+    return _head(0x00, value)
+
+
+def encode_policy_ids(items: Sequence[str]) -> bytes:
+    """Encode a list of policy identifiers as a CBOR array of text strings
+
+    Signers reuse a handful of policy sets and may memoize the result;
+    verifiers encode whatever ``policy_ids`` a receipt carries, uncached.
+    """
+    if not isinstance(items, (list, tuple)):
+        raise TypeError(f"Expected list, got {type(items).__name__}")
+    return _head(0x80, len(items)) + b"".join([_enc_tstr(item) for item in items])
+
+
+def _cbor_keyval(key: bytes, value: str) -> bytes:
+    """Encode one text-string map entry"""
+    return _key_header(key) + _enc_tstr(value)
+
+
+def signer_fragment(pubkey: Union[str, bytes], version: str) -> bytes:
+    """Pre-encode the ``pubkey`` and ``version`` entries
+
+    Both are fixed for a signer's lifetime and adjacent in canonical key
+    order, so a signer can encode them once and reuse the bytes for every
+    receipt via ``encode_core_with_fragment``.
+    """
+    return _KEY_PUBKEY + _enc_binary(pubkey) + _cbor_keyval(b"version", version)
+
+
+def encode_core_with_fragment(
+    fragment: bytes,
+    code_ref: str,
+    ts: int,
+    nonce: Union[str, bytes],
+    input_hash: Union[str, bytes],
+    output_hash: Union[str, bytes],
+    policy_array: bytes,
+    hash_alg: Optional[str] = None,
+) -> bytes:
+    """Encode the core receipt fields around precomputed signer fragments
+
+    Args:
+        fragment: Output of ``signer_fragment`` for the signing key
+        code_ref: Reference to computation code
+        ts: Timestamp in Unix milliseconds
+        nonce: Base64-encoded nonce, or raw nonce bytes (TECP-0.2)
+        input_hash: Base64-encoded input hash, or raw digest (TECP-0.2)
+        output_hash: Base64-encoded output hash, or raw digest (TECP-0.2)
+        policy_array: Output of ``encode_policy_ids`` for the policy identifiers
+        hash_alg: Payload hash algorithm; omitted from the map when None
+
+    Returns:
+        Canonical CBOR bytes covered by the receipt signature
+
+    Raises:
+        TypeError: If a field has the wrong type
+    """
+    return b"".join((
+        _MAP_HEADER if hash_alg is None else _MAP_HEADER_HASH_ALG,
+        _KEY_TS, _enc_uint(ts),
+        _KEY_NONCE, _enc_binary(nonce),
+        fragment,
+        _KEY_CODE_REF, _enc_tstr(code_ref),
+        b"" if hash_alg is None else _KEY_HASH_ALG + _enc_tstr(hash_alg),
+        _KEY_INPUT_HASH, _enc_binary(input_hash),
+        _KEY_POLICY_IDS, policy_array,
+        _KEY_OUTPUT_HASH, _enc_binary(output_hash),
+    ))
+
+
+def encode_core(
+    code_ref: str,
+    ts: int,
+    nonce: Union[str, bytes],
+    input_hash: Union[str, bytes],
+    output_hash: Union[str, bytes],
+    policy_ids: Sequence[str],
+    pubkey: Union[str, bytes],
+    version: str,
+    hash_alg: Optional[str] = None,
+) -> bytes:
+    """Encode the core receipt fields as canonical CBOR
+
+    Args:
+        code_ref: Reference to computation code
+        ts: Timestamp in Unix milliseconds
+        nonce: Base64-encoded nonce, or raw nonce bytes (TECP-0.2)
+        input_hash: Base64-encoded input hash, or raw digest (TECP-0.2)
+        output_hash: Base64-encoded output hash, or raw digest (TECP-0.2)
+        policy_ids: List of policy identifiers
+        pubkey: Base64-encoded Ed25519 public key, or raw key (TECP-0.2)
+        version: TECP protocol version
+        hash_alg: Payload hash algorithm; omitted from the map when None
+
+    Returns:
+        Canonical CBOR bytes covered by the receipt signature
+
+    Raises:
+        TypeError: If a field has the wrong type
+    """
+    return encode_core_with_fragment(
+        signer_fragment(pubkey, version),
+        code_ref, ts, nonce, input_hash, output_hash,
+        encode_policy_ids(policy_ids), hash_alg
+    )
@@ -0,0 +1,15 @@
+"""
+TECP Exceptions
+"""
+
+
+class TECPError(Exception):
+    """Base class for all TECP errors"""
+
+
+class SignatureError(TECPError):
+    """Raised when a receipt cannot be signed, e.g. for a malformed key or field"""
+
+
+class VerificationError(TECPError):
+    """Raised when a receipt cannot be verified"""
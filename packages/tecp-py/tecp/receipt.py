@@ -4,24 +4,225 @@ TECP Receipt Implementation
 Core receipt signing and verification functionality.
 """
 
+import os
+import mmap
 import time
+import functools
 import hashlib
-import secrets
 import base64
-from typing import Optional, Dict, Any
+import binascii
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Sequence, Tuple, Union
 
-import cbor2
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
 from cryptography.hazmat.primitives.serialization import Encoding, PrivateFormat, PublicFormat, NoEncryption
 
+try:
+    import blake3
+except ImportError:  # pragma: no cover - optional dependency
+    blake3 = None
+
+from .canonical import encode_core, encode_core_with_fragment, encode_policy_ids, signer_fragment
 from .types import (
-    Receipt, FullReceipt, ReceiptExtensions, CreateReceiptParams,
+    FullReceipt, ReceiptExtensions, CreateReceiptParams,
     VerificationResult, VerificationError, VerificationDetails,
-    TECP_VERSION, MAX_RECEIPT_AGE_MS, MAX_CLOCK_SKEW_MS, ERROR_CODES
+    TECP_VERSION, TECP_VERSION_BINARY, TECP_VERSION_HASH_ALG, TECP_VERSION_BINARY_HASH_ALG,
+    NONCE_BYTES, DEFAULT_HASH_ALG, HASH_ALGORITHMS,
+    MAX_RECEIPT_AGE_MS, MAX_CLOCK_SKEW_MS
 )
 from .exceptions import TECPError, SignatureError, VerificationError as VerificationException
 
+# Ed25519 field prime, and the y-coordinates of the eight small-order
+# points (orders 1, 2, 4 and 8)
+_ED25519_P = 2**255 - 19
+_ED25519_Y8 = 0x05FC536D880238B13933C6D305ACDFD5F098EFF289F4C345B027B2C28F95E826
+_ED25519_SMALL_ORDER_Y = frozenset((0, 1, _ED25519_P - 1, _ED25519_Y8, _ED25519_P - _ED25519_Y8))
+
+
+def _is_weak_point(encoded: bytes) -> bool:
+    """Whether an Ed25519 point encoding is non-canonical or of small order
+    
+    Backends disagree on such points: OpenSSL (cryptography) accepts a
+    small-order public key or R, under which forged signatures verify,
+    while libsodium rejects them. Rejecting them up front gives the same
+    answer whichever backend is installed.
+    """
+    y = int.from_bytes(encoded[:32], "little") & ((1 << 255) - 1)
+    return y >= _ED25519_P or y in _ED25519_SMALL_ORDER_Y
+
+
+# Ed25519 backend: prefer libsodium via PyNaCl when installed, which signs
+# and verifies roughly twice as fast as the OpenSSL path in cryptography.
+try:
+    from nacl.signing import SigningKey as _NaclSigningKey, VerifyKey as _NaclVerifyKey
+except ImportError:  # pragma: no cover - optional dependency
+    _NaclSigningKey = None
+
+if _NaclSigningKey is not None:
+    ED25519_BACKEND = "pynacl"
+
+    def _ed25519_private_key(raw: bytes) -> Any:
+        return _NaclSigningKey(raw)
+
+    def _ed25519_public_key(raw: bytes) -> Any:
+        if len(raw) == 32 and _is_weak_point(raw):
+            raise ValueError("Ed25519 public key is non-canonical or of small order")
+        return _NaclVerifyKey(raw)
+
+    def _ed25519_sign(priv: Any, msg: bytes) -> bytes:
+        return priv.sign(msg).signature
+
+    def _ed25519_verify(pub: Any, sig: bytes, msg: bytes) -> None:
+        pub.verify(msg, sig)  # libsodium already rejects a small-order R
+else:
+    ED25519_BACKEND = "cryptography"
+
+    def _ed25519_private_key(raw: bytes) -> Any:
+        return Ed25519PrivateKey.from_private_bytes(raw)
+
+    def _ed25519_public_key(raw: bytes) -> Any:
+        if len(raw) == 32 and _is_weak_point(raw):
+            raise ValueError("Ed25519 public key is non-canonical or of small order")
+        return Ed25519PublicKey.from_public_bytes(raw)
+
+    def _ed25519_sign(priv: Any, msg: bytes) -> bytes:
+        return priv.sign(msg)
+
+    def _ed25519_verify(pub: Any, sig: bytes, msg: bytes) -> None:
+        if _is_weak_point(sig):
+            raise ValueError("Ed25519 signature R is non-canonical or of small order")
+        pub.verify(sig, msg)
+
+
+# Single-call base64 encoder (no newline, no intermediate translate step)
+_b64 = binascii.b2a_base64
+
+
+
+def _b64decode_strict(data: str) -> bytes:
+    """Decode base64, rejecting any string that is not the canonical encoding
+    
+    Used for fields signed as raw bytes, where the receipt's string form
+    is not itself covered by the signature.
+    """
+    raw = base64.b64decode(data, validate=True)
+    if _b64(raw, newline=False).decode('ascii') != data:
+        raise ValueError("Non-canonical base64 encoding")
+    return raw
+
+
+# Core receipt fields and their exact JSON types
+_REQUIRED_FIELDS = (
+    ("version", str),
+    ("code_ref", str),
+    ("ts", int),
+    ("nonce", str),
+    ("input_hash", str),
+    ("output_hash", str),
+    ("policy_ids", list),
+    ("sig", str),
+    ("pubkey", str),
+)
+
+# Receipt version by (binary fields signed raw, signed hash_alg present).
+# Receipts that carry hash_alg get their own versions so that verifiers
+# predating it reject them as unknown rather than failing the signature.
+_VERSIONS = {
+    (False, False): TECP_VERSION,
+    (True, False): TECP_VERSION_BINARY,
+    (False, True): TECP_VERSION_HASH_ALG,
+    (True, True): TECP_VERSION_BINARY_HASH_ALG,
+}
+_VERSION_LAYOUT = {version: layout for layout, version in _VERSIONS.items()}
+
+# Payload accepted for hashing: in-memory buffer or path to a file
+Payload = Union[bytes, bytearray, memoryview, "os.PathLike[str]"]
+
+# Payload hash constructors by algorithm name (all 256-bit digests)
+_HASHERS: Dict[str, Any] = {
+    "sha256": hashlib.sha256,
+    "blake2b": functools.partial(hashlib.blake2b, digest_size=32),
+}
+if blake3 is not None:
+    _HASHERS["blake3"] = blake3.blake3
+
+# Payload digest size in bytes (every supported algorithm)
+_DIGEST_BYTES = 32
+
+# hashlib and blake3 release the GIL while hashing, so payloads at least
+# this large are hashed concurrently.
+_PARALLEL_HASH_MIN_BYTES = 1024 * 1024
+
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """Return the shared hashing thread pool, creating it on first use"""
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 2, thread_name_prefix="tecp-hash"
+                )
+    return _hash_executor
+
+
+def _reset_hash_executor() -> None:
+    """Drop the inherited thread pool in a forked child (its threads are gone)"""
+    global _hash_executor, _hash_executor_lock
+    _hash_executor = None
+    _hash_executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_hash_executor)
+
+
+def _payload_size(data: Payload) -> int:
+    """Size of a payload in bytes"""
+    if isinstance(data, os.PathLike):
+        return os.stat(data).st_size
+    return memoryview(data).nbytes
+
+
+def _payload_digest(data: Payload, hash_alg: str = DEFAULT_HASH_ALG) -> bytes:
+    """Digest of a buffer, or of a file via mmap without copying it"""
+    hasher = _HASHERS[hash_alg]
+    if not isinstance(data, os.PathLike):
+        return hasher(data).digest()
+    h = hasher()
+    with open(data, "rb") as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+    return h.digest()
+
+
+def _hash_b64_many(payloads: Sequence[Payload], hash_alg: str = DEFAULT_HASH_ALG) -> List[str]:
+    """Compute base64 digests of payloads, hashing large ones concurrently
+    
+    Payloads of at least _PARALLEL_HASH_MIN_BYTES go to the shared pool,
+    except the last one, which is hashed on the calling thread while the
+    pool works. Small payloads are hashed inline.
+    """
+    large = [i for i, p in enumerate(payloads) if _payload_size(p) >= _PARALLEL_HASH_MIN_BYTES]
+    futures = {}
+    if len(large) > 1:
+        executor = _get_hash_executor()
+        futures = {i: executor.submit(_payload_digest, payloads[i], hash_alg) for i in large[:-1]}
+    digests = [
+        None if i in futures else _payload_digest(p, hash_alg)
+        for i, p in enumerate(payloads)
+    ]
+    for i, future in futures.items():
+        digests[i] = future.result()
+    return [_b64(d, newline=False).decode('ascii') for d in digests]
+
 
 class ReceiptSigner:
     """TECP Receipt Signer
@@ -29,25 +230,61 @@ class ReceiptSigner:
     Creates cryptographically signed receipts for ephemeral computation.
     """
     
-    def __init__(self, private_key: bytes, public_key: bytes):
+    def __init__(
+        self,
+        private_key: bytes,
+        public_key: bytes,
+        hash_alg: str = DEFAULT_HASH_ALG,
+        raw_preimage: bool = False
+    ):
         """Initialize signer with Ed25519 key pair
         
         Args:
             private_key: Ed25519 private key bytes
             public_key: Ed25519 public key bytes
+            hash_alg: Payload hash algorithm ("sha256", "blake2b" or "blake3");
+                anything but SHA-256 is recorded in a signed ``hash_alg``
+                field (TECP-0.3, or TECP-0.4 with raw fields)
+            raw_preimage: Sign the nonce, payload digests and public key as
+                CBOR byte strings (TECP-0.2, or TECP-0.4 with ``hash_alg``)
+                instead of base64 text (TECP-0.1/0.3)
+            
+        Raises:
+            TECPError: If the hash algorithm is unknown or not installed
         """
+        if hash_alg not in HASH_ALGORITHMS:
+            raise TECPError(f"Unsupported hash algorithm: {hash_alg}")
+        if hash_alg not in _HASHERS:
+            raise TECPError(f"Hash algorithm {hash_alg} requires the {hash_alg} package")
+        self._hash_alg = hash_alg
+        
+        self._raw_fields = bool(raw_preimage)
+        self._version = _VERSIONS[self._raw_fields, hash_alg != DEFAULT_HASH_ALG]
+        
         try:
-            self._private_key = Ed25519PrivateKey.from_private_bytes(private_key)
-            self._public_key = Ed25519PublicKey.from_public_bytes(public_key)
-            self._public_key_b64 = base64.b64encode(public_key).decode('ascii')
+            self._private_key = _ed25519_private_key(private_key)
+            self._public_key = _ed25519_public_key(public_key)
+            self._public_key_b64 = _b64(public_key, newline=False).decode('ascii')
+            self._signed_pubkey = bytes(public_key) if self._raw_fields else self._public_key_b64
+            self._signer_fragment = signer_fragment(self._signed_pubkey, self._version)
         except Exception as e:
             raise SignatureError(f"Invalid key format: {e}")
+        
+        # Ed25519 signatures are deterministic, so a payload that was signed
+        # before can reuse its signature. Only payloads with a caller-chosen
+        # nonce can repeat; random-nonce receipts bypass the cache.
+        self._sign_canonical = functools.lru_cache(maxsize=4096)(self._sign_uncached)
+        
+        # A signer uses a handful of policy sets, so their CBOR arrays are
+        # memoized here rather than in the encoder, which also serves the
+        # verifier and must not hold on to untrusted receipts' policy_ids.
+        self._policy_arrays = functools.lru_cache(maxsize=64)(encode_policy_ids)
     
     def create_receipt(
         self,
         code_ref: str,
-        input_data: bytes,
-        output_data: bytes,
+        input_data: Payload,
+        output_data: Payload,
         policy_ids: list[str],
         extensions: Optional[ReceiptExtensions] = None,
         timestamp: Optional[int] = None,
@@ -57,8 +294,47 @@ class ReceiptSigner:
         
         Args:
             code_ref: Reference to computation code
-            input_data: Raw input data
-            output_data: Raw output data  
+            input_data: Raw input data, or path to a file holding it
+            output_data: Raw output data, or path to a file holding it
+            policy_ids: List of policy identifiers
+            extensions: Optional receipt extensions
+            timestamp: Custom timestamp (defaults to now)
+            nonce: Custom nonce (defaults to random)
+            
+        Returns:
+            Signed TECP receipt
+            
+        Raises:
+            SignatureError: If signing fails
+        """
+        input_hash, output_hash = _hash_b64_many((input_data, output_data), self._hash_alg)
+        return self.create_receipt_prehashed(
+            code_ref, input_hash, output_hash, policy_ids, extensions, timestamp, nonce
+        )
+    
+    def create_receipt_prehashed(
+        self,
+        code_ref: str,
+        input_hash: str,
+        output_hash: str,
+        policy_ids: list[str],
+        extensions: Optional[ReceiptExtensions] = None,
+        timestamp: Optional[int] = None,
+        nonce: Optional[str] = None
+    ) -> FullReceipt:
+        """Create a signed TECP receipt from payload digests computed elsewhere
+        
+        Avoids hashing payloads a second time when the pipeline already has
+        their digests. The caller attests that ``input_hash`` and
+        ``output_hash`` are the base64 digests of the actual input and
+        output under this signer's hash algorithm (SHA-256 by default);
+        the signer cannot check this, and the receipt vouches for whatever
+        digests it is given.
+        
+        Args:
+            code_ref: Reference to computation code
+            input_hash: Base64 digest of the input
+            output_hash: Base64 digest of the output
             policy_ids: List of policy identifiers
             extensions: Optional receipt extensions
             timestamp: Custom timestamp (defaults to now)
@@ -67,24 +343,160 @@ class ReceiptSigner:
         Returns:
             Signed TECP receipt
             
+        Raises:
+            SignatureError: If a digest is malformed or signing fails
+        """
+        for name, digest in (("input_hash", input_hash), ("output_hash", output_hash)):
+            try:
+                valid = type(digest) is str and len(_b64decode_strict(digest)) == _DIGEST_BYTES
+            except ValueError:
+                valid = False
+            if not valid:
+                raise SignatureError(f"Invalid {name}: expected base64 of a 32-byte digest")
+        
+        receipt_data = self._sign_core(code_ref, input_hash, output_hash, policy_ids, timestamp, nonce)
+        
+        # Add extensions if provided (already validated models, kept as-is)
+        if extensions:
+            if extensions.key_erasure:
+                receipt_data["key_erasure"] = extensions.key_erasure
+            if extensions.environment:
+                receipt_data["environment"] = extensions.environment
+            if extensions.log_inclusion:
+                receipt_data["log_inclusion"] = extensions.log_inclusion
+        
+        # Every field was produced above (or type-checked by the encoder),
+        # so skip pydantic re-validation
+        return FullReceipt.model_construct(**receipt_data)
+    
+    def create_receipt_deterministic(
+        self,
+        code_ref: str,
+        input_data: Payload,
+        output_data: Payload,
+        policy_ids: list[str],
+        timestamp: int,
+        extensions: Optional[ReceiptExtensions] = None
+    ) -> FullReceipt:
+        """Create a receipt whose nonce is derived from its content
+        
+        The nonce is the first 16 bytes of
+        ``sha256(input_hash || output_hash || code_ref)``, so replaying the
+        same computation with the same timestamp yields the same receipt
+        and reuses the cached signature instead of signing again.
+        
+        Only use this when identical receipts for identical computations
+        are acceptable: the nonce no longer distinguishes two runs, so any
+        replay protection must rely on content and timestamp.
+        
+        Args:
+            code_ref: Reference to computation code
+            input_data: Raw input data, or path to a file holding it
+            output_data: Raw output data, or path to a file holding it
+            policy_ids: List of policy identifiers
+            timestamp: Receipt timestamp in Unix milliseconds
+            extensions: Optional receipt extensions
+            
+        Returns:
+            Signed TECP receipt
+            
         Raises:
             SignatureError: If signing fails
         """
+        input_hash, output_hash = _hash_b64_many((input_data, output_data), self._hash_alg)
+        seed = f"{input_hash}{output_hash}{code_ref}".encode("utf-8")
+        nonce = _b64(hashlib.sha256(seed).digest()[:NONCE_BYTES], newline=False).decode('ascii')
+        return self.create_receipt_prehashed(
+            code_ref, input_hash, output_hash, policy_ids, extensions, timestamp, nonce
+        )
+    
+    def create_receipts(self, params: List[CreateReceiptParams]) -> List[Dict[str, Any]]:
+        """Create signed receipts for many computations at once
+        
+        Payloads for the whole batch are hashed together (large ones on the
+        shared thread pool), receipts without an explicit timestamp share
+        one, and random nonces are drawn in a single ``os.urandom`` call.
+        
+        Args:
+            params: Parameters for each receipt
+            
+        Returns:
+            Signed receipts as plain dicts, in input order
+            
+        Raises:
+            SignatureError: If signing any receipt fails
+        """
+        now = time.time_ns() // 1_000_000
+        payloads = [p.input_data for p in params] + [p.output_data for p in params]
+        digests = _hash_b64_many(payloads, self._hash_alg)
+        nonce_pool = os.urandom(NONCE_BYTES * len(params))
+        
+        receipts = []
+        for i, p in enumerate(params):
+            receipt_data = self._sign_core(
+                p.code_ref,
+                digests[i],
+                digests[len(params) + i],
+                p.policy_ids,
+                now if p.timestamp is None else p.timestamp,
+                p.nonce,
+                nonce_pool[i * NONCE_BYTES:(i + 1) * NONCE_BYTES]
+            )
+            if p.extensions:
+                for name in ("key_erasure", "environment", "log_inclusion"):
+                    extension = getattr(p.extensions, name)
+                    if extension:
+                        receipt_data[name] = extension.model_dump()
+            receipts.append(receipt_data)
+        return receipts
+    
+    def _sign_core(
+        self,
+        code_ref: str,
+        input_hash: str,
+        output_hash: str,
+        policy_ids: list[str],
+        timestamp: Optional[int],
+        nonce: Optional[str],
+        nonce_bytes: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """Build and sign the core receipt fields
+        
+        Returns:
+            Core receipt fields plus ``sig``
+        """
         # Generate timestamp and nonce if not provided
         if timestamp is None:
-            timestamp = int(time.time() * 1000)
+            timestamp = time.time_ns() // 1_000_000
         
+        sign = self._sign_uncached if nonce is None else self._sign_canonical
         if nonce is None:
-            nonce_bytes = secrets.token_bytes(16)
-            nonce = base64.b64encode(nonce_bytes).decode('ascii')
+            if nonce_bytes is None:
+                nonce_bytes = os.urandom(NONCE_BYTES)
+            nonce = _b64(nonce_bytes, newline=False).decode('ascii')
+        elif self._raw_fields:
+            try:
+                nonce_bytes = _b64decode_strict(nonce)
+            except Exception as e:
+                raise SignatureError(f"Invalid nonce: {e}")
         
-        # Hash input and output
-        input_hash = self._sha256_b64(input_data)
-        output_hash = self._sha256_b64(output_data)
+        # TECP-0.2 and 0.4 sign the raw bytes behind the base64 receipt fields
+        if self._raw_fields:
+            signed_nonce = nonce_bytes
+            try:
+                signed_input_hash = _b64decode_strict(input_hash)
+                signed_output_hash = _b64decode_strict(output_hash)
+            except Exception as e:
+                raise SignatureError(f"Invalid digest: {e}")
+        else:
+            signed_nonce = nonce
+            signed_input_hash = input_hash
+            signed_output_hash = output_hash
+        hash_alg = None if self._hash_alg == DEFAULT_HASH_ALG else self._hash_alg
         
         # Create core receipt (fields included in signature)
-        core_receipt = {
-            "version": TECP_VERSION,
+        receipt_data = {
+            "version": self._version,
             "code_ref": code_ref,
             "ts": timestamp,
             "nonce": nonce,
@@ -93,51 +505,32 @@ class ReceiptSigner:
             "policy_ids": policy_ids,
             "pubkey": self._public_key_b64
         }
+        if hash_alg is not None:
+            receipt_data["hash_alg"] = hash_alg
         
         # Sign the core receipt
         try:
-            cbor_bytes = self._canonical_cbor(core_receipt)
-            signature = self._private_key.sign(cbor_bytes)
-            sig_b64 = base64.b64encode(signature).decode('ascii')
+            cbor_bytes = encode_core_with_fragment(
+                self._signer_fragment, code_ref, timestamp, signed_nonce,
+                signed_input_hash, signed_output_hash,
+                self._policy_array(policy_ids), hash_alg
+            )
+            signature = sign(cbor_bytes)
+            receipt_data["sig"] = _b64(signature, newline=False).decode('ascii')
         except Exception as e:
             raise SignatureError(f"Signing failed: {e}")
         
-        # Create full receipt with signature
-        receipt_data = {
-            **core_receipt,
-            "sig": sig_b64
-        }
-        
-        # Add extensions if provided
-        if extensions:
-            if extensions.key_erasure:
-                receipt_data["key_erasure"] = extensions.key_erasure.dict()
-            if extensions.environment:
-                receipt_data["environment"] = extensions.environment.dict()
-            if extensions.log_inclusion:
-                receipt_data["log_inclusion"] = extensions.log_inclusion.dict()
-        
-        return FullReceipt(**receipt_data)
-    
-    def _sha256_b64(self, data: bytes) -> str:
-        """Compute SHA-256 hash and encode as base64"""
-        digest = hashlib.sha256(data).digest()
-        return base64.b64encode(digest).decode('ascii')
+        return receipt_data
     
-    def _canonical_cbor(self, obj: Dict[str, Any]) -> bytes:
-        """Encode object as canonical CBOR for signing"""
-        # Sort keys for deterministic encoding
-        sorted_obj = self._sort_dict_recursively(obj)
-        return cbor2.dumps(sorted_obj, canonical=True)
+    def _policy_array(self, policy_ids: Sequence[str]) -> bytes:
+        """Encode policy identifiers, memoized per signer by content"""
+        if not isinstance(policy_ids, (list, tuple)):
+            return encode_policy_ids(policy_ids)  # raises TypeError
+        return self._policy_arrays(tuple(policy_ids))
     
-    def _sort_dict_recursively(self, obj: Any) -> Any:
-        """Recursively sort dictionary keys"""
-        if isinstance(obj, dict):
-            return {k: self._sort_dict_recursively(v) for k, v in sorted(obj.items())}
-        elif isinstance(obj, list):
-            return [self._sort_dict_recursively(item) for item in obj]
-        else:
-            return obj
+    def _sign_uncached(self, cbor_bytes: bytes) -> bytes:
+        """Sign canonical CBOR bytes with the signer's key"""
+        return _ed25519_sign(self._private_key, cbor_bytes)
 
 
 class ReceiptVerifier:
@@ -155,43 +548,106 @@ class ReceiptVerifier:
         Returns:
             Verification result with details and errors
         """
-        start_time = time.time()
+        return self._verify(receipt, time.time_ns() // 1_000_000)
+    
+    def verify_batch(self, receipts: List[Dict[str, Any]]) -> List[VerificationResult]:
+        """Verify many receipts in one call
+        
+        All receipts are checked against the same reference time, and
+        signing payloads go through the same encoder as ``verify`` so
+        batch and single verification always agree.
+        
+        Args:
+            receipts: Receipt data to verify
+            
+        Returns:
+            One verification result per receipt, in input order
+        """
+        now = time.time_ns() // 1_000_000
+        return [self._verify(receipt, now) for receipt in receipts]
+    
+    def _verify(self, receipt: Dict[str, Any], now: int) -> VerificationResult:
+        """Verify a single receipt against reference time ``now``"""
+        start_ns = time.perf_counter_ns()
         errors = []
         
-        # Initialize verification details
-        details = VerificationDetails(
+        # Initialize verification details. Result models are built with
+        # model_construct: every value is produced here, so validation would
+        # only add cost to the verify hot path.
+        details = VerificationDetails.model_construct(
             signature="Invalid",
             timestamp="OK", 
             schema="OK",
             transparency_log="Not checked"
         )
         
-        try:
-            # Validate schema
-            receipt_obj = Receipt(**receipt)
-            details.schema = "OK"
-        except Exception as e:
-            errors.append(VerificationError(
+        # Validate schema
+        for name, expected_type in _REQUIRED_FIELDS:
+            value = receipt.get(name)
+            if type(value) is expected_type:
+                continue
+            if value is None:
+                error = VerificationError.model_construct(
+                    code="E-SCHEMA-001",
+                    message=f"Missing required field: {name}",
+                    field=name
+                )
+            else:
+                error = VerificationError.model_construct(
+                    code="E-SCHEMA-002",
+                    message=f"Invalid field type: {name} must be {expected_type.__name__}",
+                    field=name
+                )
+            errors.append(error)
+            if details.schema == "OK":
+                details.schema = f"Schema error: {error.message}"
+
+        version = receipt.get("version")
+        hash_alg = receipt.get("hash_alg")
+        layout = _VERSION_LAYOUT.get(version) if type(version) is str else None
+        error = None
+        if type(version) is str and layout is None:
+            error = VerificationError.model_construct(
+                code="E-SCHEMA-004",
+                message=f"Unknown receipt version: {version}",
+                field="version"
+            )
+        elif layout is not None and layout[1] and hash_alg is None:
+            error = VerificationError.model_construct(
                 code="E-SCHEMA-001",
-                message=f"Schema validation failed: {e}",
-                field="schema"
-            ))
-            details.schema = f"Schema error: {e}"
-        
+                message=f"Missing required field: hash_alg ({version} receipt)",
+                field="hash_alg"
+            )
+        elif layout is not None and not layout[1] and hash_alg is not None:
+            error = VerificationError.model_construct(
+                code="E-SCHEMA-003",
+                message=f"Unexpected field: hash_alg is not part of {version} receipts",
+                field="hash_alg"
+            )
+        elif hash_alg is not None and hash_alg not in HASH_ALGORITHMS:
+            error = VerificationError.model_construct(
+                code="E-SCHEMA-003",
+                message=f"Unknown hash algorithm: {hash_alg}",
+                field="hash_alg"
+            )
+        if error is not None:
+            errors.append(error)
+            if details.schema == "OK":
+                details.schema = f"Schema error: {error.message}"
+
         # Validate timestamp
         try:
-            now = int(time.time() * 1000)
             ts = receipt.get("ts", 0)
             
             if ts > now + MAX_CLOCK_SKEW_MS:
-                errors.append(VerificationError(
+                errors.append(VerificationError.model_construct(
                     code="E-TS-002",
                     message="Clock skew exceeded",
                     field="ts"
                 ))
                 details.timestamp = "Skew"
             elif now - ts > MAX_RECEIPT_AGE_MS:
-                errors.append(VerificationError(
+                errors.append(VerificationError.model_construct(
                     code="E-TS-003", 
                     message="Receipt expired",
                     field="ts"
@@ -201,31 +657,36 @@ class ReceiptVerifier:
                 details.timestamp = "OK"
                 
         except Exception as e:
-            errors.append(VerificationError(
+            errors.append(VerificationError.model_construct(
                 code="E-TS-001",
                 message=f"Timestamp validation failed: {e}",
                 field="ts"
             ))
             details.timestamp = "Invalid"
         
-        # Verify signature
-        try:
-            if self._verify_signature(receipt):
-                details.signature = "Valid"
-            else:
-                errors.append(VerificationError(
-                    code="E-SIG-002",
-                    message="Signature verification failed",
+        # Verify signature, the expensive step, only if the cheap checks passed
+        receipt_size = 0
+        if errors:
+            details.signature = "Not checked"
+        else:
+            try:
+                signature_ok, receipt_size = self._verify_signature(receipt)
+                if signature_ok:
+                    details.signature = "Valid"
+                else:
+                    errors.append(VerificationError.model_construct(
+                        code="E-SIG-002",
+                        message="Signature verification failed",
+                        field="sig"
+                    ))
+                    details.signature = "Invalid"
+            except Exception as e:
+                errors.append(VerificationError.model_construct(
+                    code="E-SIG-001",
+                    message=f"Signature format error: {e}",
                     field="sig"
                 ))
                 details.signature = "Invalid"
-        except Exception as e:
-            errors.append(VerificationError(
-                code="E-SIG-001",
-                message=f"Signature format error: {e}",
-                field="sig"
-            ))
-            details.signature = "Invalid"
         
         # Check transparency log inclusion if present
         if "log_inclusion" in receipt:
@@ -233,10 +694,9 @@ class ReceiptVerifier:
             details.transparency_log = "Not implemented"
         
         # Calculate performance metrics
-        verification_time = int((time.time() - start_time) * 1000)
-        receipt_size = len(str(receipt).encode('utf-8'))
+        verification_time = (time.perf_counter_ns() - start_ns) // 1_000_000
         
-        return VerificationResult(
+        return VerificationResult.model_construct(
             valid=len(errors) == 0,
             errors=errors,
             details=details,
@@ -246,47 +706,50 @@ class ReceiptVerifier:
             }
         )
     
-    def _verify_signature(self, receipt: Dict[str, Any]) -> bool:
-        """Verify Ed25519 signature on receipt"""
+    def _verify_signature(self, receipt: Dict[str, Any]) -> Tuple[bool, int]:
+        """Verify Ed25519 signature on receipt
+        
+        Returns:
+            Whether the signature is valid, and the size of the signed
+            canonical CBOR payload (0 if it could not be encoded)
+        """
+        cbor_len = 0
         try:
-            # Extract core fields for verification
-            core_fields = {
-                "version": receipt["version"],
-                "code_ref": receipt["code_ref"],
-                "ts": receipt["ts"],
-                "nonce": receipt["nonce"],
-                "input_hash": receipt["input_hash"],
-                "output_hash": receipt["output_hash"],
-                "policy_ids": receipt["policy_ids"],
-                "pubkey": receipt["pubkey"]
-            }
+            version = receipt["version"]
+            nonce = receipt["nonce"]
+            input_hash = receipt["input_hash"]
+            output_hash = receipt["output_hash"]
+            pubkey = receipt["pubkey"]
+            
+            # TECP-0.2 and 0.4 sign the raw bytes behind the base64 fields
+            if _VERSION_LAYOUT[version][0]:
+                nonce = _b64decode_strict(nonce)
+                input_hash = _b64decode_strict(input_hash)
+                output_hash = _b64decode_strict(output_hash)
+                pubkey = _b64decode_strict(pubkey)
             
-            # Encode as canonical CBOR
-            cbor_bytes = self._canonical_cbor(core_fields)
+            # Encode core fields as canonical CBOR straight from the receipt
+            cbor_bytes = encode_core(
+                receipt["code_ref"], receipt["ts"], nonce,
+                input_hash, output_hash, receipt["policy_ids"],
+                pubkey, version, receipt.get("hash_alg")
+            )
+            cbor_len = len(cbor_bytes)
             
             # Decode signature and public key
             signature = base64.b64decode(receipt["sig"])
-            public_key_bytes = base64.b64decode(receipt["pubkey"])
+            public_key = self._load_pubkey(receipt["pubkey"])
             
             # Verify signature
-            public_key = Ed25519PublicKey.from_public_bytes(public_key_bytes)
-            public_key.verify(signature, cbor_bytes)
+            _ed25519_verify(public_key, signature, cbor_bytes)
             
-            return True
+            return True, cbor_len
             
         except Exception:
-            return False
+            return False, cbor_len
     
-    def _canonical_cbor(self, obj: Dict[str, Any]) -> bytes:
-        """Encode object as canonical CBOR"""
-        sorted_obj = self._sort_dict_recursively(obj)
-        return cbor2.dumps(sorted_obj, canonical=True)
-    
-    def _sort_dict_recursively(self, obj: Any) -> Any:
-        """Recursively sort dictionary keys"""
-        if isinstance(obj, dict):
-            return {k: self._sort_dict_recursively(v) for k, v in sorted(obj.items())}
-        elif isinstance(obj, list):
-            return [self._sort_dict_recursively(item) for item in obj]
-        else:
-            return obj
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _load_pubkey(pubkey_b64: str) -> Any:
+        """Decode and parse a base64 public key, cached across receipts"""
+        return _ed25519_public_key(base64.b64decode(pubkey_b64))
@@ -24,6 +24,7 @@ class Receipt(BaseModel):
     policy_ids: List[str] = Field(description="List of policy identifiers")
     sig: str = Field(description="Ed25519 signature (base64)")
     pubkey: str = Field(description="Ed25519 public key (base64)")
+    hash_alg: Optional[str] = Field(None, description="Payload hash algorithm (SHA-256 when absent)")
 
     class Config:
         """Pydantic configuration"""
@@ -105,6 +106,12 @@ class CreateReceiptParams(BaseModel):
 
 # Constants
 TECP_VERSION = "TECP-0.1"
+TECP_VERSION_BINARY = "TECP-0.2"  # nonce, digests and pubkey signed as CBOR byte strings
+TECP_VERSION_HASH_ALG = "TECP-0.3"  # TECP-0.1 plus a signed hash_alg field
+TECP_VERSION_BINARY_HASH_ALG = "TECP-0.4"  # TECP-0.2 plus a signed hash_alg field
+NONCE_BYTES = 16
+DEFAULT_HASH_ALG = "sha256"
+HASH_ALGORITHMS = ("sha256", "blake2b", "blake3")
 MAX_RECEIPT_AGE_MS = 24 * 60 * 60 * 1000  # 24 hours
 MAX_CLOCK_SKEW_MS = 5 * 60 * 1000  # 5 minutes
 MAX_RECEIPT_SIZE_BYTES = 8192  # 8KB
@@ -0,0 +1,100 @@
+"""
+Tests for the specialized canonical CBOR encoder
+
+encode_core must produce exactly what ``cbor2.dumps(..., canonical=True)``
+produces for the same map, since verifiers in other languages re-encode
+receipts with general-purpose canonical encoders.
+"""
+
+import os
+import random
+
+import cbor2
+import pytest
+
+from tecp.canonical import encode_core, encode_core_with_fragment, encode_policy_ids, signer_fragment
+
+
+_TIMESTAMPS = [
+    0, 1, 23, 24, 255, 256, 65535, 65536, 2**32 - 1, 2**32, 1692115200000, 2**64 - 1,
+    -1, -24, -25, -256, -2**32, -2**64,
+]
+_ALPHABET = "abcXYZ019+/=_-:. éß€漢\U0001F600"
+
+
+def _text(rng: random.Random, max_len: int) -> str:
+    # Lengths straddle the 1-, 2- and 3-byte CBOR length headers
+    n = rng.choice([0, 1, 23, 24, 255, 256, rng.randint(0, max_len)])
+    return "".join(rng.choice(_ALPHABET) for _ in range(n))
+
+
+def _binary(rng: random.Random, raw: bool):
+    if raw:
+        return os.urandom(rng.choice([0, 16, 23, 24, 32, 255, 256]))
+    return _text(rng, 64)
+
+
+def _core(rng: random.Random, raw: bool, hash_alg: bool):
+    core = {
+        "code_ref": _text(rng, 300),
+        "ts": rng.choice(_TIMESTAMPS + [rng.randint(-2**64, 2**64 - 1)]),
+        "nonce": _binary(rng, raw),
+        "input_hash": _binary(rng, raw),
+        "output_hash": _binary(rng, raw),
+        "policy_ids": [_text(rng, 40) for _ in range(rng.choice([0, 1, 2, 23, 24, 30]))],
+        "pubkey": _binary(rng, raw),
+        "version": _text(rng, 12),
+    }
+    if hash_alg:
+        core["hash_alg"] = rng.choice(["blake2b", "blake3", _text(rng, 30)])
+    return core
+
+
+@pytest.mark.parametrize("raw", [False, True])
+@pytest.mark.parametrize("hash_alg", [False, True])
+def test_encode_core_matches_cbor2_canonical(raw, hash_alg):
+    rng = random.Random(f"{raw}-{hash_alg}")
+    for _ in range(500):
+        core = _core(rng, raw, hash_alg)
+        assert encode_core(**core) == cbor2.dumps(core, canonical=True), core
+
+
+@pytest.mark.parametrize("raw", [False, True])
+def test_encode_core_with_fragment_matches_encode_core(raw):
+    rng = random.Random(raw)
+    for _ in range(200):
+        core = _core(rng, raw, hash_alg=rng.random() < 0.5)
+        fragment = signer_fragment(core["pubkey"], core["version"])
+        encoded = encode_core_with_fragment(
+            fragment, core["code_ref"], core["ts"], core["nonce"],
+            core["input_hash"], core["output_hash"],
+            encode_policy_ids(core["policy_ids"]), core.get("hash_alg")
+        )
+        assert encoded == encode_core(**core)
+
+
+def test_encode_policy_ids_accepts_tuples():
+    assert encode_policy_ids(("a", "b")) == encode_policy_ids(["a", "b"]) == cbor2.dumps(["a", "b"])
+
+
+@pytest.mark.parametrize("field, value", [
+    ("ts", 1.0),
+    ("ts", True),
+    ("code_ref", b"git:abc"),
+    ("version", None),
+    ("policy_ids", "no_retention"),
+    ("policy_ids", ["no_retention", 1]),
+    ("nonce", 12345),
+])
+def test_encode_core_rejects_wrong_types(field, value):
+    core = _core(random.Random(0), raw=False, hash_alg=False)
+    core[field] = value
+    with pytest.raises(TypeError):
+        encode_core(**core)
+
+
+def test_encode_core_rejects_out_of_range_timestamp():
+    core = _core(random.Random(0), raw=False, hash_alg=False)
+    core["ts"] = 2**64
+    with pytest.raises(ValueError):
+        encode_core(**core)
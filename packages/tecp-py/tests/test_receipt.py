@@ -0,0 +1,274 @@
+"""
+Tests for receipt signing and verification
+
+Fixed vectors live in spec/test-vectors/valid/receipt-versions.json and are
+shared with the SDK tests, so both implementations are held to the same
+bytes for every receipt version and hash algorithm.
+"""
+
+import base64
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from tecp import ReceiptSigner, ReceiptVerifier, SignatureError, TECPError
+from tecp import receipt as receipt_module
+from tecp.types import CreateReceiptParams
+
+
+VECTORS_PATH = Path(__file__).resolve().parents[3] / "spec" / "test-vectors" / "valid" / "receipt-versions.json"
+VECTORS = json.loads(VECTORS_PATH.read_text())["vectors"]
+
+try:
+    import blake3  # noqa: F401
+    HAVE_BLAKE3 = True
+except ImportError:
+    HAVE_BLAKE3 = False
+
+
+def _vector_params():
+    params = []
+    for vector in VECTORS:
+        marks = []
+        if vector["test_data"]["hash_alg"] == "blake3" and not HAVE_BLAKE3:
+            marks.append(pytest.mark.skip(reason="blake3 not installed"))
+        params.append(pytest.param(vector, id=vector["name"], marks=marks))
+    return params
+
+
+def _keypair(seed: bytes):
+    public_key = Ed25519PrivateKey.from_private_bytes(seed).public_key()
+    return seed, public_key.public_bytes(Encoding.Raw, PublicFormat.Raw)
+
+
+def _signer_for(test_data) -> ReceiptSigner:
+    private_key, public_key = _keypair(bytes.fromhex(test_data["private_key"]))
+    return ReceiptSigner(
+        private_key,
+        public_key,
+        hash_alg=test_data["hash_alg"],
+        raw_preimage=test_data["raw_preimage"],
+    )
+
+
+@pytest.fixture
+def signer():
+    return ReceiptSigner(*_keypair(bytes(range(32))))
+
+
+@pytest.fixture
+def freeze_time(monkeypatch):
+    """Pin the verifier's clock to a given Unix millisecond timestamp"""
+    def freeze(ts_ms: int):
+        monkeypatch.setattr(receipt_module.time, "time_ns", lambda: ts_ms * 1_000_000)
+    return freeze
+
+
+@pytest.mark.parametrize("vector", _vector_params())
+def test_vector_signing(vector):
+    test_data = vector["test_data"]
+    receipt = _signer_for(test_data).create_receipt(
+        test_data["code_ref"],
+        test_data["input_data"].encode(),
+        test_data["output_data"].encode(),
+        test_data["policy_ids"],
+        timestamp=test_data["timestamp"],
+        nonce=test_data["nonce"],
+    )
+    assert receipt.model_dump(exclude_none=True) == vector["expected_receipt"]
+
+
+@pytest.mark.parametrize("vector", _vector_params())
+def test_vector_verification(vector, freeze_time):
+    receipt = vector["expected_receipt"]
+    freeze_time(receipt["ts"])
+    result = ReceiptVerifier().verify(receipt)
+    assert result.valid, result.errors
+    assert result.details.signature == "Valid"
+
+    # The signature covers exactly the published preimage
+    public_key = Ed25519PrivateKey.from_private_bytes(bytes.fromhex(vector["test_data"]["private_key"])).public_key()
+    public_key.verify(base64.b64decode(receipt["sig"]), bytes.fromhex(vector["cbor_bytes"]))
+
+
+@pytest.mark.parametrize("vector", _vector_params())
+@pytest.mark.parametrize("field", ["ts", "nonce", "input_hash", "output_hash", "policy_ids", "code_ref", "hash_alg"])
+def test_vector_tampering_fails(vector, field, freeze_time):
+    receipt = dict(vector["expected_receipt"])
+    freeze_time(receipt["ts"])
+    if field == "ts":
+        receipt["ts"] += 1
+    elif field == "policy_ids":
+        receipt["policy_ids"] = receipt["policy_ids"][:1]
+    elif field == "code_ref":
+        receipt["code_ref"] += "x"
+    elif field == "hash_alg":
+        if "hash_alg" not in receipt:
+            pytest.skip("SHA-256 receipts carry no hash_alg")
+        receipt["hash_alg"] = "blake3" if receipt["hash_alg"] == "blake2b" else "blake2b"
+    else:
+        receipt[field] = base64.b64encode(hashlib.sha256(receipt[field].encode()).digest()[:len(base64.b64decode(receipt[field]))]).decode()
+    assert not ReceiptVerifier().verify(receipt).valid
+
+
+@pytest.mark.parametrize("version, hash_alg, code", [
+    ("TECP-9.9", None, "E-SCHEMA-004"),
+    ("TECP-0.3", None, "E-SCHEMA-001"),
+    ("TECP-0.4", None, "E-SCHEMA-001"),
+    ("TECP-0.1", "blake2b", "E-SCHEMA-003"),
+    ("TECP-0.2", "blake2b", "E-SCHEMA-003"),
+    ("TECP-0.3", "md5", "E-SCHEMA-003"),
+])
+def test_version_and_hash_alg_must_agree(signer, version, hash_alg, code):
+    receipt = signer.create_receipt("git:abc", b"in", b"out", ["no_retention"]).model_dump(exclude_none=True)
+    receipt["version"] = version
+    receipt.pop("hash_alg", None)
+    if hash_alg is not None:
+        receipt["hash_alg"] = hash_alg
+    result = ReceiptVerifier().verify(receipt)
+    assert not result.valid
+    assert code in [error.code for error in result.errors]
+
+
+@pytest.mark.parametrize("hash_alg, raw, version", [
+    ("sha256", False, "TECP-0.1"),
+    ("sha256", True, "TECP-0.2"),
+    ("blake2b", False, "TECP-0.3"),
+    ("blake2b", True, "TECP-0.4"),
+])
+def test_signer_version(hash_alg, raw, version):
+    signer = ReceiptSigner(*_keypair(bytes(range(32))), hash_alg=hash_alg, raw_preimage=raw)
+    receipt = signer.create_receipt("git:abc", b"in", b"out", ["no_retention"]).model_dump()
+    assert receipt["version"] == version
+    assert ReceiptVerifier().verify(receipt).valid
+
+
+def test_unsupported_hash_alg():
+    with pytest.raises(TECPError):
+        ReceiptSigner(*_keypair(bytes(range(32))), hash_alg="md5")
+
+
+SMALL_ORDER_POINTS = [
+    bytes(32),
+    b"\x01" + bytes(31),
+    bytes.fromhex("26e8958fc2b227b045c3f489f2ef98f0d5dfac05d3c63339b13802886d53fc05"),
+    bytes.fromhex("c7176a703d4dd84fba3c0b760d10670f2a2053fa2c39ccc64ec7fd7792ac037a"),
+    bytes.fromhex("ecffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff7f"),
+    (2**255 - 19 + 3).to_bytes(32, "little"),  # non-canonical y
+]
+
+
+@pytest.mark.parametrize("point", SMALL_ORDER_POINTS, ids=lambda p: p.hex()[:8])
+def test_weak_public_keys_are_rejected(signer, point):
+    receipt = signer.create_receipt("git:abc", b"in", b"out", ["no_retention"]).model_dump()
+    receipt["pubkey"] = base64.b64encode(point).decode()
+    # With a small-order key and R, an all-zero scalar verifies under
+    # OpenSSL for any message; every backend must refuse it
+    receipt["sig"] = base64.b64encode(point + bytes(32)).decode()
+    assert not ReceiptVerifier().verify(receipt).valid
+
+
+def test_identity_forgery_rejected(signer):
+    receipt = signer.create_receipt("git:abc", b"in", b"out", ["no_retention"]).model_dump()
+    receipt["pubkey"] = base64.b64encode(b"\x01" + bytes(31)).decode()
+    receipt["sig"] = base64.b64encode(b"\x01" + bytes(63)).decode()
+    assert not ReceiptVerifier().verify(receipt).valid
+
+
+def test_create_receipt_deterministic(signer):
+    first = signer.create_receipt_deterministic("git:abc", b"in", b"out", ["no_retention"], timestamp=1692115200000)
+    second = signer.create_receipt_deterministic("git:abc", b"in", b"out", ["no_retention"], timestamp=1692115200000)
+    other = signer.create_receipt_deterministic("git:abc", b"in", b"out2", ["no_retention"], timestamp=1692115200000)
+    assert first == second
+    assert first.nonce != other.nonce
+
+
+def test_create_receipt_prehashed_matches_create_receipt(signer):
+    input_hash = base64.b64encode(hashlib.sha256(b"in").digest()).decode()
+    output_hash = base64.b64encode(hashlib.sha256(b"out").digest()).decode()
+    prehashed = signer.create_receipt_prehashed(
+        "git:abc", input_hash, output_hash, ["no_retention"], timestamp=5, nonce="AAAAAAAAAAAAAAAAAAAAAA=="
+    )
+    hashed = signer.create_receipt(
+        "git:abc", b"in", b"out", ["no_retention"], timestamp=5, nonce="AAAAAAAAAAAAAAAAAAAAAA=="
+    )
+    assert prehashed == hashed
+
+
+@pytest.mark.parametrize("input_hash", [
+    "",
+    "not base64",
+    "!" * 44,
+    base64.b64encode(bytes(30)).decode(),
+    base64.b64encode(bytes(33)).decode(),
+    b"x" * 44,
+])
+def test_create_receipt_prehashed_rejects_bad_digests(signer, input_hash):
+    output_hash = base64.b64encode(hashlib.sha256(b"out").digest()).decode()
+    with pytest.raises(SignatureError):
+        signer.create_receipt_prehashed("git:abc", input_hash, output_hash, ["no_retention"])
+
+
+def test_create_receipt_from_file(signer, tmp_path):
+    path = tmp_path / "input.bin"
+    path.write_bytes(b"x" * 100_000)
+    from_path = signer.create_receipt("git:abc", path, b"out", [], timestamp=5, nonce="AAAAAAAAAAAAAAAAAAAAAA==")
+    from_bytes = signer.create_receipt("git:abc", b"x" * 100_000, b"out", [], timestamp=5, nonce="AAAAAAAAAAAAAAAAAAAAAA==")
+    assert from_path.input_hash == from_bytes.input_hash
+
+
+def test_create_receipts_matches_create_receipt(signer):
+    params = [
+        CreateReceiptParams(
+            code_ref=f"git:{i}",
+            input_data=b"in" * i,
+            output_data=b"out" * (i + 1),
+            policy_ids=["no_retention"],
+            timestamp=1692115200000 + i,
+            nonce="AAAAAAAAAAAAAAAAAAAAAA==",
+        )
+        for i in range(10)
+    ]
+    receipts = signer.create_receipts(params)
+    assert len(receipts) == len(params)
+    for p, receipt in zip(params, receipts):
+        single = signer.create_receipt(
+            p.code_ref, p.input_data, p.output_data, p.policy_ids, timestamp=p.timestamp, nonce=p.nonce
+        )
+        assert receipt == single.model_dump(exclude_none=True)
+
+
+def test_create_receipts_random_nonces_are_unique(signer):
+    params = [
+        CreateReceiptParams(code_ref="git:abc", input_data=b"in", output_data=b"out", policy_ids=[])
+        for _ in range(50)
+    ]
+    receipts = signer.create_receipts(params)
+    assert len({r["nonce"] for r in receipts}) == 50
+    assert len({r["ts"] for r in receipts}) == 1
+    assert all(result.valid for result in ReceiptVerifier().verify_batch(receipts))
+
+
+def test_verify_batch_matches_verify(signer):
+    receipts = [
+        signer.create_receipt("git:abc", b"in%d" % i, b"out", ["no_retention"]).model_dump()
+        for i in range(5)
+    ]
+    receipts[2]["output_hash"] = receipts[2]["input_hash"]
+    receipts[3] = {"ts": 1}
+    verifier = ReceiptVerifier()
+    batch = verifier.verify_batch(receipts)
+    assert [r.valid for r in batch] == [True, True, False, False, True]
+    assert [r.valid for r in batch] == [verifier.verify(r).valid for r in receipts]
+
+
+def test_verify_does_not_cache_policy_ids(signer):
+    receipt = signer.create_receipt("git:abc", b"in", b"out", ["no_retention", "eu_region"]).model_dump()
+    verifier = ReceiptVerifier()
+    assert verifier.verify(receipt).valid
+    receipt["policy_ids"].append("extra")
+    assert not verifier.verify(receipt).valid
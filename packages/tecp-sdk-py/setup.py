@@ -35,7 +35,7 @@ setup(
     install_requires=[
         "cryptography>=41.0.0",
         "cbor2>=5.4.0",
-        "requests>=2.31.0",
+        "httpx[http2]>=0.24.0",
         "pydantic>=2.0.0",
     ],
     extras_require={
@@ -45,12 +45,20 @@ setup(
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.0.0",
-            "types-requests>=2.31.0",
         ],
         "async": [
             "aiohttp>=3.8.0",
             "asyncio>=3.4.3",
         ],
+        "libipld": [
+            "libipld>=1.0.0",
+        ],
+        "orjson": [
+            "orjson>=3.9.0",
+        ],
+        "blake3": [
+            "blake3>=0.3.0",
+        ],
     },
     classifiers=[
         "Development Status :: 4 - Beta",
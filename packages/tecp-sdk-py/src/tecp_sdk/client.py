@@ -4,24 +4,461 @@ TECP Client Implementation
 Main client class for creating and verifying TECP receipts in Python.
 """
 
+import io
+import os
 import json
+import base64
 import time
 import hashlib
-import secrets
-from typing import Optional, Dict, List, Any, Union
+import functools
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, BinaryIO, Sequence, Tuple, Union
 from dataclasses import asdict
 
 import cbor2
-import requests
+import httpx
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
 from cryptography.hazmat.primitives.serialization import Encoding, PrivateFormat, PublicFormat, NoEncryption
 
-from .types import Receipt, VerificationResult, TECPProfile, PolicyResult
+from .types import Receipt, VerificationResult, TECPProfile, PolicyResult, ErrorCode
+
+try:
+    import blake3
+except ImportError:  # optional dependency
+    blake3 = None
 from .exceptions import TECPError, SignatureError, TimestampError, PolicyError
 from .policies import PolicyRuntime
 
 
+_B64ENCODE = base64.b64encode
+_B64DECODE = base64.b64decode
+
+# Receipt age and clock-skew limits per profile: (max_age_ms, max_skew_ms)
+_PROFILE_LIMITS: Dict[str, Tuple[int, int]] = {
+    "tecp-lite": (7 * 24 * 60 * 60 * 1000, 15 * 60 * 1000),  # 7 days, 15 minutes
+    "tecp-v0.1": (24 * 60 * 60 * 1000, 5 * 60 * 1000),  # 24 hours, 5 minutes
+    "tecp-strict": (60 * 60 * 1000, 60 * 1000),  # 1 hour, 1 minute
+}
+
+# CBOR backend for signing preimages. cbor2's C extension is the default
+# (cbor2 >= 6 ships it as cbor2._cbor2, older releases as top-level
+# _cbor2). TECP_CBOR_BACKEND=libipld switches to libipld's DAG-CBOR
+# encoder, whose deterministic encoding is identical to canonical CBOR for
+# the string/int/list fields a receipt signs. It is not used for TECP-0.2
+# preimages: libipld encodes any byte string that parses as a CID as a
+# tag-42 link, which a random digest occasionally does.
+CBOR_BACKEND = os.environ.get("TECP_CBOR_BACKEND", "cbor2")
+
+try:
+    from cbor2 import _cbor2 as _cbor_c
+except ImportError:
+    try:
+        import _cbor2 as _cbor_c
+    except ImportError:
+        _cbor_c = None
+
+if _cbor_c is None:
+    warnings.warn(
+        "cbor2 C extension not available; receipt encoding falls back to "
+        "the pure-Python cbor2 encoder, which is several times slower",
+        RuntimeWarning,
+    )
+    _CBOREncoder = cbor2.CBOREncoder
+else:
+    _CBOREncoder = _cbor_c.CBOREncoder
+
+if CBOR_BACKEND == "libipld":
+    from libipld import encode_dag_cbor as _encode_dag_cbor
+elif CBOR_BACKEND == "cbor2":
+    _encode_dag_cbor = None
+else:
+    raise ImportError(f"Unknown TECP_CBOR_BACKEND: {CBOR_BACKEND!r} (expected 'cbor2' or 'libipld')")
+
+# Core signing fields in canonical CBOR key order (RFC 8949: encoded length
+# first, then bytewise), i.e. the order cbor2.dumps(..., canonical=True)
+# emits them in
+_SIGNING_FIELDS = (
+    "ts",
+    "nonce",
+    "pubkey",
+    "version",
+    "code_ref",
+    "input_hash",
+    "policy_ids",
+    "output_hash",
+)
+
+# Optional signed "hash_alg" entry sorts directly after code_ref
+_HASH_ALG_AFTER = "code_ref"
+
+TECP_VERSION = "TECP-0.1"
+TECP_VERSION_BINARY = "TECP-0.2"  # nonce, digests and pubkey signed as CBOR byte strings
+TECP_VERSION_HASH_ALG = "TECP-0.3"  # TECP-0.1 plus a signed hash_alg field
+TECP_VERSION_BINARY_HASH_ALG = "TECP-0.4"  # TECP-0.2 plus a signed hash_alg field
+
+# Receipt versions: (binary fields signed raw, signed hash_alg present).
+# Receipts with hash_alg get their own versions so verifiers predating it
+# reject them as unknown rather than failing the signature.
+_VERSION_LAYOUTS = {
+    TECP_VERSION: (False, False),
+    TECP_VERSION_BINARY: (True, False),
+    TECP_VERSION_HASH_ALG: (False, True),
+    TECP_VERSION_BINARY_HASH_ALG: (True, True),
+}
+_VERSIONS = {layout: version for version, layout in _VERSION_LAYOUTS.items()}
+
+# Fields signed as raw CBOR byte strings under TECP-0.2 (base64 in the receipt)
+_BINARY_FIELDS = ("nonce", "pubkey", "input_hash", "output_hash")
+_BINARY_FIELD_INDEXES = tuple(_SIGNING_FIELDS.index(name) for name in _BINARY_FIELDS)
+
+
+def _b64decode_strict(data: str) -> bytes:
+    """
+    Decode base64, rejecting any string that is not the canonical encoding.
+    
+    Under TECP-0.2 the signature covers the decoded bytes rather than the
+    string, so accepting alternative encodings would let a receipt's text
+    change without invalidating its signature.
+    """
+    raw = base64.b64decode(data, validate=True)
+    if _B64ENCODE(raw).decode('ascii') != data:
+        raise ValueError("Non-canonical base64 encoding")
+    return raw
+
+
+# Signing preimages of recently created or verified receipts, keyed on the
+# signed field values they were encoded from. A preimage is a pure function
+# of those values, so nothing a receipt carries can supply its own bytes.
+# Only small, schema-typed receipts are cached, and the oldest entry is
+# evicted once the cache is full.
+_PREIMAGE_CACHE_SIZE = 1024
+_PREIMAGE_CACHE_MAX_CHARS = 1024
+_preimage_cache: Dict[tuple, bytes] = {}
+_preimage_cache_lock = threading.Lock()
+
+
+def _preimage_cache_key(values: Sequence[Any], hash_alg: Optional[str] = None) -> Optional[tuple]:
+    """
+    Cache key for a signing preimage, or None if it must not be cached.
+    
+    Requires the exact receipt field types: equal values of other types
+    (``True == 1 == 1.0``) encode differently. policy_ids is copied to a
+    tuple so later in-place edits to the list are not masked by the cache.
+    """
+    ts, nonce, pubkey, version, code_ref, input_hash, policy_ids, output_hash = values
+    if type(ts) is not int or (type(policy_ids) is not list and type(policy_ids) is not tuple):
+        return None
+    if hash_alg is not None and type(hash_alg) is not str:
+        return None
+    size = 0
+    for value in (nonce, pubkey, version, code_ref, input_hash, output_hash, *policy_ids):
+        if type(value) is not str:
+            return None
+        size += len(value)
+    if size > _PREIMAGE_CACHE_MAX_CHARS:
+        return None
+    return (ts, nonce, pubkey, version, code_ref, input_hash, tuple(policy_ids), output_hash, hash_alg)
+
+
+def _remember_preimage(key: tuple, preimage: bytes) -> None:
+    """Add a preimage to the cache, evicting the oldest entry when full."""
+    with _preimage_cache_lock:
+        if len(_preimage_cache) >= _PREIMAGE_CACHE_SIZE:
+            del _preimage_cache[next(iter(_preimage_cache))]
+        _preimage_cache[key] = preimage
+
+
+# Fixed-layout encoding of the signing map. Every key and the map header are
+# constants, so a preimage is the template bytes interleaved with each
+# value's head and body; the general-purpose encoder is only needed when a
+# value falls outside the receipt schema.
+def _cbor_head(major: int, n: int) -> bytes:
+    """Encode a CBOR initial byte plus argument in its shortest form."""
+    if n < 24:
+        return bytes((major | n,))
+    if n < 0x100:
+        return bytes((major | 24, n))
+    if n < 0x10000:
+        return bytes((major | 25,)) + n.to_bytes(2, "big")
+    if n < 0x100000000:
+        return bytes((major | 26,)) + n.to_bytes(4, "big")
+    return bytes((major | 27,)) + n.to_bytes(8, "big")
+
+
+_TSTR_HEADS = tuple(_cbor_head(0x60, n) for n in range(256))
+_BSTR_HEADS = tuple(_cbor_head(0x40, n) for n in range(256))
+_SIGNING_KEYS = tuple(_TSTR_HEADS[len(name)] + name.encode("ascii") for name in _SIGNING_FIELDS)
+_HASH_ALG_KEY = _TSTR_HEADS[8] + b"hash_alg"
+_MAP_HEAD = _cbor_head(0xA0, len(_SIGNING_FIELDS))
+_MAP_HEAD_HASH_ALG = _cbor_head(0xA0, len(_SIGNING_FIELDS) + 1)
+_UINT_MAX = 0x10000000000000000
+
+
+def _tstr(value: str) -> bytes:
+    """Encode a text string (head plus UTF-8 body)."""
+    raw = value.encode("utf-8")
+    n = len(raw)
+    return (_TSTR_HEADS[n] if n < 256 else _cbor_head(0x60, n)) + raw
+
+
+def _text_or_binary(value: Any) -> Optional[bytes]:
+    """Encode a byte string for raw ``bytes``, a text string for ``str``, else None."""
+    if type(value) is bytes:
+        n = len(value)
+        return (_BSTR_HEADS[n] if n < 256 else _cbor_head(0x40, n)) + value
+    if type(value) is str:
+        return _tstr(value)
+    return None
+
+
+def _encode_receipt_preimage_fast(
+    ts: Any,
+    nonce: Any,
+    pubkey: Any,
+    version: Any,
+    code_ref: Any,
+    input_hash: Any,
+    policy_ids: Any,
+    output_hash: Any,
+    hash_alg: Optional[str] = None,
+) -> Optional[bytes]:
+    """
+    Encode the signing map from its fixed template, or None if off-schema.
+    
+    Arguments are in ``_SIGNING_FIELDS`` order. Binary fields are byte
+    strings when given as ``bytes`` (TECP-0.2) and text strings when given
+    as base64 ``str``. Returns None for any value the template does not
+    cover (e.g. a non-int timestamp), so the caller can fall back to the
+    general encoder and produce exactly what cbor2 would.
+    """
+    if type(ts) is not int or not -_UINT_MAX <= ts < _UINT_MAX:
+        return None
+    if type(version) is not str or type(code_ref) is not str:
+        return None
+    if hash_alg is not None and type(hash_alg) is not str:
+        return None
+    if type(policy_ids) is not list and type(policy_ids) is not tuple:
+        return None
+    for item in policy_ids:
+        if type(item) is not str:
+            return None
+    nonce = _text_or_binary(nonce)
+    pubkey = _text_or_binary(pubkey)
+    input_hash = _text_or_binary(input_hash)
+    output_hash = _text_or_binary(output_hash)
+    if nonce is None or pubkey is None or input_hash is None or output_hash is None:
+        return None
+    
+    key_ts, key_nonce, key_pubkey, key_version, key_code_ref, key_input, key_policies, key_output = _SIGNING_KEYS
+    return b"".join((
+        _MAP_HEAD if hash_alg is None else _MAP_HEAD_HASH_ALG,
+        key_ts, _cbor_head(0x00, ts) if ts >= 0 else _cbor_head(0x20, -1 - ts),
+        key_nonce, nonce,
+        key_pubkey, pubkey,
+        key_version, _tstr(version),
+        key_code_ref, _tstr(code_ref),
+        b"" if hash_alg is None else _HASH_ALG_KEY + _tstr(hash_alg),
+        key_input, input_hash,
+        key_policies, _cbor_head(0x80, len(policy_ids)), *map(_tstr, policy_ids),
+        key_output, output_hash,
+    ))
+
+
+# Payload accepted for hashing: in-memory buffer or binary file-like object
+HashInput = Union[bytes, bytearray, memoryview, BinaryIO]
+
+# File-like payloads are streamed through a reusable buffer of this size
+_STREAM_CHUNK_BYTES = 1 << 16
+
+# Payload hash algorithms (all 256-bit digests). Receipts that use anything
+# other than the default carry a signed "hash_alg" field.
+DEFAULT_HASH_ALG = "sha256"
+HASH_ALGORITHMS = ("sha256", "blake2b", "blake3")
+
+_HASHERS: Dict[str, Any] = {
+    "sha256": hashlib.sha256,
+    "blake2b": functools.partial(hashlib.blake2b, digest_size=32),
+}
+if blake3 is not None:
+    _HASHERS["blake3"] = blake3.blake3
+
+# hashlib.file_digest (Python 3.11+) streams files in C. It hashes objects
+# with getbuffer() (BytesIO) from offset 0 rather than the current position,
+# so it is only used for OS-level files; see _is_os_file.
+_file_digest = getattr(hashlib, "file_digest", None)
+
+# Inputs at least this large have their two digests computed concurrently;
+# hashlib releases the GIL while hashing, so a worker thread overlaps the
+# input and output hashes on separate cores
+_PARALLEL_HASH_MIN_BYTES = 1 << 20
+
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """Return the shared hashing thread pool, creating it on first use."""
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tecp-hash")
+    return _hash_executor
+
+
+def _reset_hash_executor() -> None:
+    """Drop the parent's pool in a forked child (its threads do not survive)."""
+    global _hash_executor, _hash_executor_lock
+    _hash_executor = None
+    _hash_executor_lock = threading.Lock()
+
+
+def _now_ms() -> int:
+    """Current Unix time in milliseconds, in integer arithmetic (no float)."""
+    return time.time_ns() // 1_000_000
+
+
+# Ed25519 field prime, and the y-coordinates of the eight small-order
+# points (orders 1, 2, 4 and 8)
+_ED25519_P = 2**255 - 19
+_ED25519_Y8 = 0x05FC536D880238B13933C6D305ACDFD5F098EFF289F4C345B027B2C28F95E826
+_ED25519_SMALL_ORDER_Y = frozenset((0, 1, _ED25519_P - 1, _ED25519_Y8, _ED25519_P - _ED25519_Y8))
+
+
+def _is_weak_point(encoded: bytes) -> bool:
+    """
+    Whether an Ed25519 point encoding is non-canonical or of small order.
+    
+    OpenSSL accepts a small-order public key or signature R, under which
+    forged signatures verify; libsodium (and so tecp-py with PyNaCl) rejects
+    them. Checking here keeps both implementations in agreement.
+    """
+    y = int.from_bytes(encoded[:32], "little") & ((1 << 255) - 1)
+    return y >= _ED25519_P or y in _ED25519_SMALL_ORDER_Y
+
+
+@functools.lru_cache(maxsize=1024)
+def _pubkey_from_bytes(public_key_bytes: bytes) -> Ed25519PublicKey:
+    """Parse a raw Ed25519 public key, cached since receipts usually share signers."""
+    if len(public_key_bytes) == 32 and _is_weak_point(public_key_bytes):
+        raise ValueError("Ed25519 public key is non-canonical or of small order")
+    return Ed25519PublicKey.from_public_bytes(public_key_bytes)
+
+
+class _NonceSource:
+    """
+    Random nonces sliced from a pooled ``os.urandom`` buffer.
+    
+    Refilling 4 KiB at a time makes one getrandom() call per 256 nonces
+    instead of one per receipt. Every byte is handed out at most once.
+    """
+    
+    def __init__(self, nonce_size: int = 16, pool_size: int = 4096):
+        self._nonce_size = nonce_size
+        self._pool_size = pool_size
+        self._reset()
+    
+    def _reset(self) -> None:
+        """Discard pooled bytes; also run in forked children so they never reuse the parent's."""
+        self._lock = threading.Lock()
+        self._pool = b""
+        self._offset = 0
+    
+    def next(self) -> bytes:
+        """Return a fresh random nonce."""
+        with self._lock:
+            start = self._offset
+            end = start + self._nonce_size
+            if end > len(self._pool):
+                self._pool = os.urandom(self._pool_size)
+                start, end = 0, self._nonce_size
+            self._offset = end
+            return self._pool[start:end]
+
+
+_nonce_source = _NonceSource()
+
+
+def _after_fork_in_child() -> None:
+    _reset_hash_executor()
+    _nonce_source._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _is_os_file(data: Any) -> bool:
+    """Whether ``data`` is a readable file backed by a file descriptor."""
+    if hasattr(data, "getbuffer") or not hasattr(data, "readinto"):
+        return False
+    try:
+        data.fileno()
+    except (AttributeError, OSError, ValueError):  # io.UnsupportedOperation is both
+        return False
+    return True
+
+
+def _digest_stream(data: HashInput, hash_alg: str = DEFAULT_HASH_ALG) -> bytes:
+    """
+    Digest of an in-memory buffer or a binary file-like object.
+    
+    Buffers (bytes, bytearray, memoryview) are hashed in place without
+    copying. File-like objects are hashed from their current position
+    through one reusable 64 KiB buffer (or by hashlib.file_digest for OS
+    files where available), so the payload never has to be resident in
+    memory at once.
+    """
+    hasher_ctor = _HASHERS[hash_alg]
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return hasher_ctor(data).digest()
+    
+    if _file_digest is not None and _is_os_file(data):
+        return _file_digest(data, hasher_ctor).digest()
+    
+    hasher = hasher_ctor()
+    readinto = getattr(data, "readinto", None)
+    if readinto is not None:
+        buf = bytearray(_STREAM_CHUNK_BYTES)
+        view = memoryview(buf)
+        while True:
+            n = readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    else:
+        for chunk in iter(lambda: data.read(_STREAM_CHUNK_BYTES), b""):
+            hasher.update(chunk)
+    return hasher.digest()
+
+
+def _is_large_input(data: HashInput) -> bool:
+    """Whether hashing ``data`` is worth a worker thread (streams always are)."""
+    if isinstance(data, memoryview):
+        return data.nbytes >= _PARALLEL_HASH_MIN_BYTES
+    if isinstance(data, (bytes, bytearray)):
+        return len(data) >= _PARALLEL_HASH_MIN_BYTES
+    return True
+
+
+def _dual_digest(a: HashInput, b: HashInput, hash_alg: str = DEFAULT_HASH_ALG) -> Tuple[bytes, bytes]:
+    """
+    Compute the digests of two independent payloads.
+    
+    Small inputs are hashed inline, where thread handoff would cost more
+    than the hash. When both are large, ``a`` is hashed on a worker thread
+    while ``b`` is hashed on the calling thread.
+    """
+    if not (_is_large_input(a) and _is_large_input(b)):
+        return _digest_stream(a, hash_alg), _digest_stream(b, hash_alg)
+    future = _get_hash_executor().submit(_digest_stream, a, hash_alg)
+    b_digest = _digest_stream(b, hash_alg)
+    return future.result(), b_digest
+
+
 class TECPClient:
     """
     TECP Client for creating and verifying ephemeral computation receipts.
@@ -31,6 +468,14 @@ class TECPClient:
         profile: TECP profile to use ('tecp-lite', 'tecp-v0.1', 'tecp-strict')
         log_url: Transparency log URL for verification
         verifier_url: External verifier service URL
+        raw_preimage: Sign nonce, hashes and public key as raw CBOR byte
+            strings instead of base64 text (TECP-0.2); smaller signing
+            payload, but only verifiable by TECP-0.2-aware verifiers
+        hash_alg: Payload hash algorithm ('sha256', 'blake2b', 'blake3');
+            BLAKE3 is several times faster on multi-MB payloads and
+            requires the blake3 package. Non-SHA-256 receipts carry a
+            signed hash_alg field and version TECP-0.3 (TECP-0.4 with
+            raw_preimage)
     
     Example:
         >>> client = TECPClient(private_key=private_key, profile='tecp-v0.1')
@@ -47,30 +492,78 @@ class TECPClient:
         profile: TECPProfile = "tecp-v0.1",
         log_url: Optional[str] = None,
         verifier_url: Optional[str] = None,
+        raw_preimage: bool = False,
+        hash_alg: str = DEFAULT_HASH_ALG,
     ):
+        if hash_alg not in HASH_ALGORITHMS:
+            raise TECPError(f"Unsupported hash algorithm: {hash_alg}")
+        if hash_alg not in _HASHERS:
+            raise TECPError(f"Hash algorithm {hash_alg} requires the {hash_alg} package")
+        
         self.private_key = private_key
+        self.hash_alg = hash_alg
         self.profile = profile
         self.log_url = log_url
         self.verifier_url = verifier_url
+        self.raw_preimage = raw_preimage
         self.policy_runtime = PolicyRuntime()
+        self._http: Optional[httpx.AsyncClient] = None
         
-        # Constants
-        self.TECP_VERSION = "TECP-0.1"
-        self.MAX_RECEIPT_AGE_MS = 24 * 60 * 60 * 1000  # 24 hours
-        self.MAX_CLOCK_SKEW_MS = 5 * 60 * 1000  # 5 minutes
+        # Profile-specific settings (unknown profiles get the tecp-v0.1 limits)
+        self.MAX_RECEIPT_AGE_MS, self.MAX_CLOCK_SKEW_MS = _PROFILE_LIMITS.get(
+            profile, _PROFILE_LIMITS["tecp-v0.1"]
+        )
+
+    async def __aenter__(self) -> "TECPClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections to the log and verifier services."""
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """
+        Return the shared async HTTP client, creating it on first use.
         
-        # Profile-specific settings
-        if profile == "tecp-lite":
-            self.MAX_RECEIPT_AGE_MS = 7 * 24 * 60 * 60 * 1000  # 7 days
-            self.MAX_CLOCK_SKEW_MS = 15 * 60 * 1000  # 15 minutes
-        elif profile == "tecp-strict":
-            self.MAX_RECEIPT_AGE_MS = 60 * 60 * 1000  # 1 hour
-            self.MAX_CLOCK_SKEW_MS = 60 * 1000  # 1 minute
+        One client per TECPClient keeps TCP/TLS sessions (HTTP/2 where the
+        server supports it) alive across log and verifier calls, without
+        blocking the event loop.
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32),
+            )
+        return self._http
+
+    @property
+    def private_key(self) -> Optional[Ed25519PrivateKey]:
+        """Ed25519 private key used to sign receipts."""
+        return self._private_key
+
+    @private_key.setter
+    def private_key(self, private_key: Optional[Ed25519PrivateKey]) -> None:
+        # Derive and serialize the public key once per key instead of per receipt
+        self._private_key = private_key
+        if private_key is None:
+            self._pubkey_raw = None
+            self._pubkey_b64 = None
+        else:
+            self._pubkey_raw = private_key.public_key().public_bytes(
+                encoding=Encoding.Raw,
+                format=PublicFormat.Raw
+            )
+            self._pubkey_b64 = self._b64encode(self._pubkey_raw)
 
     async def create_receipt(
         self,
-        input_data: Union[str, bytes],
-        output_data: Union[str, bytes],
+        input_data: Union[str, HashInput],
+        output_data: Union[str, HashInput],
         policies: Optional[List[str]] = None,
         code_ref: Optional[str] = None,
         extensions: Optional[Dict[str, Any]] = None,
@@ -78,9 +571,26 @@ class TECPClient:
         """
         Create a TECP receipt for ephemeral computation.
         
+        Awaitable wrapper around ``create_receipt_sync``; receipt creation
+        does no I/O, so synchronous callers should use that directly.
+        """
+        return self.create_receipt_sync(input_data, output_data, policies, code_ref, extensions)
+
+    def create_receipt_sync(
+        self,
+        input_data: Union[str, HashInput],
+        output_data: Union[str, HashInput],
+        policies: Optional[List[str]] = None,
+        code_ref: Optional[str] = None,
+        extensions: Optional[Dict[str, Any]] = None,
+    ) -> Receipt:
+        """
+        Create a TECP receipt for ephemeral computation, synchronously.
+        
         Args:
-            input_data: Input data that was processed
-            output_data: Output data that was produced
+            input_data: Input data that was processed (str, bytes-like,
+                or a binary file-like object, which is streamed)
+            output_data: Output data that was produced (same types)
             policies: List of policy IDs to enforce
             code_ref: Code reference (git commit, build hash, etc.)
             extensions: Additional metadata to include
@@ -101,14 +611,14 @@ class TECPClient:
             output_data = output_data.encode('utf-8')
         
         # Generate receipt fields
-        timestamp = int(time.time() * 1000)
-        nonce = secrets.token_bytes(16)
-        input_hash = hashlib.sha256(input_data).digest()
-        output_hash = hashlib.sha256(output_data).digest()
+        timestamp = _now_ms()
+        nonce = _nonce_source.next()
+        input_hash, output_hash = _dual_digest(input_data, output_data, self.hash_alg)
+        hash_alg = None if self.hash_alg == DEFAULT_HASH_ALG else self.hash_alg
         
         # Create core receipt
         receipt_data = {
-            "version": self.TECP_VERSION,
+            "version": _VERSIONS[bool(self.raw_preimage), hash_alg is not None],
             "code_ref": code_ref or f"python-sdk:{timestamp}",
             "ts": timestamp,
             "nonce": self._b64encode(nonce),
@@ -118,14 +628,18 @@ class TECPClient:
         }
         
         # Add public key
-        public_key_bytes = self.private_key.public_key().public_bytes(
-            encoding=Encoding.Raw,
-            format=PublicFormat.Raw
-        )
-        receipt_data["pubkey"] = self._b64encode(public_key_bytes)
+        receipt_data["pubkey"] = self._pubkey_b64
+        if hash_alg is not None:
+            receipt_data["hash_alg"] = hash_alg
         
         # Sign the receipt
-        canonical_cbor = self._canonical_cbor(receipt_data)
+        signing_values = [receipt_data[name] for name in _SIGNING_FIELDS]
+        preimage_key = _preimage_cache_key(signing_values, hash_alg)
+        if self.raw_preimage:
+            raw_values = (nonce, self._pubkey_raw, input_hash, output_hash)
+            for index, raw in zip(_BINARY_FIELD_INDEXES, raw_values):
+                signing_values[index] = raw
+        canonical_cbor = self._canonical_cbor_receipt(signing_values, hash_alg)
         signature = self.private_key.sign(canonical_cbor)
         receipt_data["sig"] = self._b64encode(signature)
         
@@ -139,6 +653,9 @@ class TECPClient:
             "version": "0.1.0"
         }
         
+        if preimage_key is not None:
+            _remember_preimage(preimage_key, canonical_cbor)
+        
         return Receipt(**receipt_data)
 
     async def verify_receipt(
@@ -158,16 +675,82 @@ class TECPClient:
         Returns:
             Verification result with validity and any errors
         """
-        errors = []
+        return self.verify_receipt_sync(receipt, require_log, profile)
+
+    def verify_receipt_sync(
+        self,
+        receipt: Receipt,
+        require_log: bool = False,
+        profile: Optional[TECPProfile] = None,
+    ) -> VerificationResult:
+        """
+        Verify a TECP receipt synchronously, without coroutine overhead.
+        
+        Same checks and result as ``verify_receipt``.
+        """
+        return self._verify_receipt(receipt, require_log, profile, _now_ms())
+
+    async def verify_receipts_batch(
+        self,
+        receipts: List[Receipt],
+        require_log: bool = False,
+        profile: Optional[TECPProfile] = None,
+    ) -> List[VerificationResult]:
+        """
+        Verify many receipts, e.g. for audit replay or log ingestion.
+        
+        All receipts are checked against one timestamp.
+        
+        Args:
+            receipts: Receipts to verify
+            require_log: Whether to require transparency log verification
+            profile: TECP profile to use for verification
+            
+        Returns:
+            One verification result per receipt, in input order
+        """
+        now = _now_ms()
+        return [
+            self._verify_receipt(receipt, require_log, profile, now)
+            for receipt in receipts
+        ]
+
+    def _verify_receipt(
+        self,
+        receipt: Receipt,
+        require_log: bool,
+        profile: Optional[TECPProfile],
+        now: int,
+    ) -> VerificationResult:
+        """Verify one receipt against the current time ``now``."""
+        # Failures set a bit and stash their message arguments; strings are
+        # only formatted if the caller reads result.errors
+        error_mask = 0
+        error_context = {}
         warnings = []
         
         try:
             # Validate basic structure
-            if receipt.version != self.TECP_VERSION:
-                errors.append(f"Invalid version: {receipt.version}")
+            layout = _VERSION_LAYOUTS.get(receipt.version)
+            if layout is None:
+                error_mask |= 1 << ErrorCode.SCHEMA_UNKNOWN_VERSION.bit
+                error_context[ErrorCode.SCHEMA_UNKNOWN_VERSION] = (receipt.version,)
+            elif layout[1] and receipt.hash_alg is None:
+                error_mask |= 1 << ErrorCode.SCHEMA_MISSING_FIELD.bit
+                error_context[ErrorCode.SCHEMA_MISSING_FIELD] = ("hash_alg",)
+            elif not layout[1] and receipt.hash_alg is not None:
+                error_mask |= 1 << ErrorCode.SCHEMA_INVALID_FORMAT.bit
+                error_context[ErrorCode.SCHEMA_INVALID_FORMAT] = (
+                    f"hash_alg is not part of {receipt.version} receipts",
+                )
+            
+            if receipt.hash_alg is not None and receipt.hash_alg not in HASH_ALGORITHMS:
+                error_mask |= 1 << ErrorCode.SCHEMA_INVALID_FORMAT.bit
+                error_context[ErrorCode.SCHEMA_INVALID_FORMAT] = (
+                    f"unknown hash algorithm {receipt.hash_alg}",
+                )
             
             # Validate timestamp
-            now = int(time.time() * 1000)
             age = now - receipt.ts
             skew = receipt.ts - now
             
@@ -175,52 +758,51 @@ class TECPClient:
             max_skew = self.MAX_CLOCK_SKEW_MS
             
             if age > max_age:
-                errors.append(f"Receipt too old: {age}ms > {max_age}ms")
+                error_mask |= 1 << ErrorCode.AGE_TOO_OLD.bit
+                error_context[ErrorCode.AGE_TOO_OLD] = (age, max_age)
             elif skew > max_skew:
-                errors.append(f"Receipt timestamp in future: {skew}ms > {max_skew}ms")
+                error_mask |= 1 << ErrorCode.AGE_FUTURE.bit
+                error_context[ErrorCode.AGE_FUTURE] = (skew, max_skew)
             
             # Verify signature
             try:
                 public_key_bytes = self._b64decode(receipt.pubkey)
-                public_key = Ed25519PublicKey.from_public_bytes(public_key_bytes)
+                public_key = _pubkey_from_bytes(public_key_bytes)
                 
                 # Reconstruct signing data
-                signing_data = {
-                    "version": receipt.version,
-                    "code_ref": receipt.code_ref,
-                    "ts": receipt.ts,
-                    "nonce": receipt.nonce,
-                    "input_hash": receipt.input_hash,
-                    "output_hash": receipt.output_hash,
-                    "policy_ids": receipt.policy_ids,
-                    "pubkey": receipt.pubkey,
-                }
-                
-                canonical_cbor = self._canonical_cbor(signing_data)
+                canonical_cbor = self._receipt_preimage(receipt)
                 signature = self._b64decode(receipt.sig)
+                if _is_weak_point(signature):
+                    raise ValueError("Ed25519 signature R is non-canonical or of small order")
                 
                 public_key.verify(signature, canonical_cbor)
                 
             except Exception as e:
-                errors.append(f"Signature verification failed: {str(e)}")
+                error_mask |= 1 << ErrorCode.SIG_VERIFICATION_FAILED.bit
+                # Keep only the message: the exception would hold its
+                # traceback, and with it this frame and the receipt
+                error_context[ErrorCode.SIG_VERIFICATION_FAILED] = (str(e),)
             
             # Validate policies (profile-dependent)
             current_profile = profile or self.profile
             if current_profile == "tecp-strict" and not receipt.policy_ids:
-                errors.append("TECP-STRICT requires at least one policy")
+                error_mask |= 1 << ErrorCode.POLICY_REQUIREMENTS_NOT_MET.bit
+                error_context[ErrorCode.POLICY_REQUIREMENTS_NOT_MET] = ()
             
-            # TODO: Transparency log verification
+            # TODO: Transparency log verification (fetch proofs via self._get_http())
             if require_log:
                 warnings.append("Transparency log verification not yet implemented")
             
         except Exception as e:
-            errors.append(f"Verification error: {str(e)}")
+            error_mask |= 1 << ErrorCode.SCHEMA_INVALID_TYPE.bit
+            error_context[ErrorCode.SCHEMA_INVALID_TYPE] = (str(e),)
         
         return VerificationResult(
-            valid=len(errors) == 0,
-            errors=errors,
+            valid=error_mask == 0,
+            error_mask=error_mask,
             warnings=warnings,
             profile=profile or self.profile,
+            error_context=error_context,
         )
 
     async def enforce_policies(
@@ -249,28 +831,83 @@ class TECPClient:
             environment=environment or {},
         )
 
-    def _canonical_cbor(self, data: Dict[str, Any]) -> bytes:
-        """Create canonical CBOR encoding with sorted keys."""
-        # Sort keys recursively
-        def sort_dict(obj):
-            if isinstance(obj, dict):
-                return {k: sort_dict(v) for k, v in sorted(obj.items())}
-            elif isinstance(obj, list):
-                return [sort_dict(item) for item in obj]
-            return obj
+    def _receipt_preimage(self, receipt: Receipt) -> bytes:
+        """
+        Return a receipt's canonical signing preimage, memoized by field values.
+        
+        The cache is keyed on the signed fields themselves, so a modified
+        receipt never matches an earlier entry and is always re-encoded
+        (and fails verification).
+        """
+        values = (
+            receipt.ts,
+            receipt.nonce,
+            receipt.pubkey,
+            receipt.version,
+            receipt.code_ref,
+            receipt.input_hash,
+            receipt.policy_ids,
+            receipt.output_hash,
+        )
+        hash_alg = receipt.hash_alg
+        key = _preimage_cache_key(values, hash_alg)
+        if key is not None:
+            preimage = _preimage_cache.get(key)
+            if preimage is not None:
+                return preimage
+        
+        if _VERSION_LAYOUTS.get(receipt.version, (False, False))[0]:
+            signing_values = list(values)
+            for index in _BINARY_FIELD_INDEXES:
+                signing_values[index] = _b64decode_strict(signing_values[index])
+            values = signing_values
+        
+        preimage = self._canonical_cbor_receipt(values, hash_alg)
+        if key is not None:
+            _remember_preimage(key, preimage)
+        return preimage
+
+    def _canonical_cbor_receipt(self, values: Sequence[Any], hash_alg: Optional[str] = None) -> bytes:
+        """
+        Encode the core signing fields without building a dict.
+        
+        Args:
+            values: Field values in ``_SIGNING_FIELDS`` order
+            hash_alg: Payload hash algorithm; omitted from the map when None
+            
+        Returns:
+            Same bytes as ``cbor2.dumps(..., canonical=True)`` on the equivalent dict
+        """
+        if _encode_dag_cbor is None or any(type(value) is bytes for value in values):
+            preimage = _encode_receipt_preimage_fast(*values, hash_alg)
+            if preimage is not None:
+                return preimage
+        else:
+            data = dict(zip(_SIGNING_FIELDS, values))
+            if hash_alg is not None:
+                data["hash_alg"] = hash_alg
+            return _encode_dag_cbor(data)
         
-        sorted_data = sort_dict(data)
-        return cbor2.dumps(sorted_data, canonical=True)
+        buf = io.BytesIO()
+        encoder = _CBOREncoder(buf, canonical=True)
+        encoder.encode_length(5, len(_SIGNING_FIELDS) + (hash_alg is not None))  # major type 5: map
+        for name, value in zip(_SIGNING_FIELDS, values):
+            encoder.encode(name)
+            encoder.encode(value)
+            if name == _HASH_ALG_AFTER and hash_alg is not None:
+                encoder.encode("hash_alg")
+                encoder.encode(hash_alg)
+        return buf.getvalue()
 
-    def _b64encode(self, data: bytes) -> str:
+    @staticmethod
+    def _b64encode(data: bytes) -> str:
         """Base64 encode bytes to string."""
-        import base64
-        return base64.b64encode(data).decode('ascii')
+        return _B64ENCODE(data).decode('ascii')
 
-    def _b64decode(self, data: str) -> bytes:
+    @staticmethod
+    def _b64decode(data: str) -> bytes:
         """Base64 decode string to bytes."""
-        import base64
-        return base64.b64decode(data.encode('ascii'))
+        return _B64DECODE(data)
 
 
 # Convenience functions
@@ -0,0 +1,25 @@
+"""
+TECP Exceptions for Python SDK
+
+Errors raised by TECPClient and the policy runtime.
+"""
+
+
+class TECPError(Exception):
+    """Base class for all TECP SDK errors."""
+
+
+class SignatureError(TECPError):
+    """Raised when a receipt cannot be signed or its signature is malformed."""
+
+
+class TimestampError(TECPError):
+    """Raised when a receipt timestamp is out of range."""
+
+
+class PolicyError(TECPError):
+    """Raised when a policy cannot be enforced."""
+
+
+class LogError(TECPError):
+    """Raised when the transparency log cannot be reached or rejects a request."""
@@ -0,0 +1,78 @@
+"""
+TECP Policy Runtime for Python SDK
+
+Dispatches policy IDs to registered enforcers. The SDK ships no built-in
+enforcers; applications register their own for the policies they claim.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List
+
+from .types import PolicyResult
+
+
+# An enforcer takes (input_data, context) and returns a PolicyResult
+PolicyEnforcer = Callable[[str, Dict[str, Any]], Awaitable[PolicyResult]]
+
+
+class PolicyRuntime:
+    """
+    Policy runtime coordinating registered enforcers.
+    
+    Unknown policy IDs are reported as violations rather than ignored, so a
+    receipt never claims a policy nothing enforced.
+    """
+    
+    def __init__(self):
+        self._enforcers: Dict[str, PolicyEnforcer] = {}
+    
+    def register_enforcer(self, policy_id: str, enforcer: PolicyEnforcer) -> None:
+        """
+        Register the enforcer for a policy ID, replacing any earlier one.
+        
+        Args:
+            policy_id: Policy identifier from the policy registry
+            enforcer: Async callable taking (input_data, context)
+        """
+        self._enforcers[policy_id] = enforcer
+    
+    async def enforce_policies(
+        self,
+        policy_ids: List[str],
+        input_data: str,
+        max_duration: int,
+        environment: Dict[str, Any],
+    ) -> PolicyResult:
+        """
+        Enforce policies in order, feeding each transformed input to the next.
+        
+        Args:
+            policy_ids: List of policy IDs to enforce
+            input_data: Input data to check
+            max_duration: Maximum processing duration in milliseconds
+            environment: Environment context
+            
+        Returns:
+            Combined policy enforcement result
+        """
+        context = {"max_duration": max_duration, "environment": environment}
+        current_input = input_data
+        evidence: Dict[str, Any] = {}
+        violations: List[str] = []
+        
+        for policy_id in policy_ids:
+            enforcer = self._enforcers.get(policy_id)
+            if enforcer is None:
+                violations.append(f"Unknown policy ID: {policy_id}")
+                continue
+            result = await enforcer(current_input, context)
+            if not result.allowed:
+                violations.extend(result.violations)
+            current_input = result.transformed_input
+            evidence[policy_id] = result.evidence
+        
+        return PolicyResult(
+            allowed=not violations,
+            transformed_input=current_input,
+            evidence=evidence,
+            violations=violations,
+        )
@@ -4,16 +4,46 @@ TECP Types for Python SDK
 Type definitions for TECP receipts and related data structures.
 """
 
+import sys
+import json
+from operator import attrgetter, itemgetter
 from typing import List, Optional, Dict, Any, Literal, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+# Slotted dataclasses (no per-instance __dict__) where supported (3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 # TECP Profile types
 TECPProfile = Literal["tecp-lite", "tecp-v0.1", "tecp-strict"]
 
 
-@dataclass
+# Receipt field names in dataclass order, for to_dict/from_dict
+_RECEIPT_CORE = (
+    "version",
+    "code_ref",
+    "ts",
+    "nonce",
+    "input_hash",
+    "output_hash",
+    "policy_ids",
+    "sig",
+    "pubkey",
+)
+_RECEIPT_OPTIONAL = ("hash_alg", "log_inclusion", "key_erasure", "environment", "anchors", "ext")
+
+_get_core_attrs = attrgetter(*_RECEIPT_CORE)
+_get_core_items = itemgetter(*_RECEIPT_CORE)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Receipt:
     """
     TECP Receipt data structure.
@@ -23,12 +53,15 @@ class Receipt:
         code_ref: Reference to code that processed the data
         ts: Timestamp in milliseconds since Unix epoch
         nonce: Random nonce for replay protection
-        input_hash: SHA-256 hash of input data (base64)
-        output_hash: SHA-256 hash of output data (base64)
+        input_hash: Hash of input data (base64; SHA-256 unless hash_alg is set)
+        output_hash: Hash of output data (base64; SHA-256 unless hash_alg is set)
         policy_ids: List of policy identifiers
         sig: Ed25519 signature over core fields (base64)
         pubkey: Ed25519 public key (base64)
     
+    Optional fields:
+        hash_alg: Payload hash algorithm when not SHA-256 (signed)
+    
     Optional extensions:
         log_inclusion: Transparency log inclusion proof
         key_erasure: Key erasure evidence
@@ -48,6 +81,9 @@ class Receipt:
     sig: str
     pubkey: str
     
+    # Signed payload hash algorithm; omitted for the SHA-256 default
+    hash_alg: Optional[str] = None
+    
     # Optional extensions
     log_inclusion: Optional[Dict[str, Any]] = None
     key_erasure: Optional[Dict[str, Any]] = None
@@ -57,74 +93,81 @@ class Receipt:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert receipt to dictionary."""
-        result = {
-            "version": self.version,
-            "code_ref": self.code_ref,
-            "ts": self.ts,
-            "nonce": self.nonce,
-            "input_hash": self.input_hash,
-            "output_hash": self.output_hash,
-            "policy_ids": self.policy_ids,
-            "sig": self.sig,
-            "pubkey": self.pubkey,
-        }
+        result = dict(zip(_RECEIPT_CORE, _get_core_attrs(self)))
         
         # Add optional fields if present
-        if self.log_inclusion:
-            result["log_inclusion"] = self.log_inclusion
-        if self.key_erasure:
-            result["key_erasure"] = self.key_erasure
-        if self.environment:
-            result["environment"] = self.environment
-        if self.anchors:
-            result["anchors"] = self.anchors
-        if self.ext:
-            result["ext"] = self.ext
+        for name in _RECEIPT_OPTIONAL:
+            value = getattr(self, name)
+            if value:
+                result[name] = value
             
         return result
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Receipt":
         """Create receipt from dictionary."""
-        return cls(
-            version=data["version"],
-            code_ref=data["code_ref"],
-            ts=data["ts"],
-            nonce=data["nonce"],
-            input_hash=data["input_hash"],
-            output_hash=data["output_hash"],
-            policy_ids=data["policy_ids"],
-            sig=data["sig"],
-            pubkey=data["pubkey"],
-            log_inclusion=data.get("log_inclusion"),
-            key_erasure=data.get("key_erasure"),
-            environment=data.get("environment"),
-            anchors=data.get("anchors"),
-            ext=data.get("ext"),
-        )
-
-
-@dataclass
+        # Positional, in field order: required fields, then optionals
+        return cls(*_get_core_items(data), *map(data.get, _RECEIPT_OPTIONAL))
+
+    def to_json(self) -> bytes:
+        """Serialize receipt to compact UTF-8 JSON with sorted keys."""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_SORT_KEYS)
+        return json.dumps(
+            self.to_dict(), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: Union[bytes, str]) -> "Receipt":
+        """Create receipt from JSON."""
+        if orjson is not None:
+            return cls.from_dict(orjson.loads(data))
+        return cls.from_dict(json.loads(data))
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class VerificationResult:
     """
     Result of receipt verification.
     
+    Failed checks are recorded as bits in ``error_mask`` (one per
+    ``ErrorCode``, see ``ErrorCode.bit``), so programmatic callers can test
+    for specific failures without string handling. Human-readable messages
+    are only formatted when ``errors`` is read.
+    
     Attributes:
         valid: Whether the receipt is cryptographically valid
-        errors: List of validation errors (if any)
+        error_mask: Bitmask of failed checks (``1 << ErrorCode.X.bit``)
         warnings: List of warnings (non-fatal issues)
         profile: TECP profile used for verification
-        error_codes: Structured error codes for programmatic handling
+        error_context: Message arguments per failed check, in detection order
     """
     
     valid: bool
-    errors: List[str]
+    error_mask: int = 0
     warnings: Optional[List[str]] = None
     profile: Optional[TECPProfile] = None
-    error_codes: Optional[List[str]] = None
+    error_context: Dict["ErrorCode", tuple] = field(default_factory=dict)
+
+    @property
+    def errors(self) -> List[str]:
+        """List of validation errors (if any)."""
+        return [
+            _ERROR_MSG_TEMPLATES.get(code, code.value).format(*args)
+            for code, args in self.error_context.items()
+        ]
+
+    @property
+    def error_codes(self) -> List[str]:
+        """Structured error codes for programmatic handling."""
+        return [code.value for code in self.error_context]
 
+    def has_error(self, code: "ErrorCode") -> bool:
+        """Whether the check identified by ``code`` failed."""
+        return bool(self.error_mask >> code.bit & 1)
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class PolicyResult:
     """
     Result of policy enforcement.
@@ -176,8 +219,28 @@ class ErrorCode(Enum):
     POLICY_VALIDATION_FAILED = "E-POLICY-002"
     POLICY_REQUIREMENTS_NOT_MET = "E-POLICY-003"
 
+    @property
+    def bit(self) -> int:
+        """Bit position of this code in ``VerificationResult.error_mask``."""
+        return _ERROR_CODE_BITS[self]
+
+
+_ERROR_CODE_BITS = {code: index for index, code in enumerate(ErrorCode)}
+
+# Message formats for VerificationResult.errors, filled from error_context
+_ERROR_MSG_TEMPLATES = {
+    ErrorCode.SCHEMA_UNKNOWN_VERSION: "Invalid version: {}",
+    ErrorCode.SCHEMA_INVALID_TYPE: "Verification error: {}",
+    ErrorCode.SCHEMA_MISSING_FIELD: "Missing required field: {}",
+    ErrorCode.SCHEMA_INVALID_FORMAT: "Invalid field format: {}",
+    ErrorCode.AGE_TOO_OLD: "Receipt too old: {}ms > {}ms",
+    ErrorCode.AGE_FUTURE: "Receipt timestamp in future: {}ms > {}ms",
+    ErrorCode.SIG_VERIFICATION_FAILED: "Signature verification failed: {}",
+    ErrorCode.POLICY_REQUIREMENTS_NOT_MET: "TECP-STRICT requires at least one policy",
+}
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LogInclusionProof:
     """Transparency log inclusion proof."""
     
@@ -186,7 +249,7 @@ class LogInclusionProof:
     log_root: str
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class KeyErasureEvidence:
     """Evidence of cryptographic key erasure."""
     
@@ -194,7 +257,7 @@ class KeyErasureEvidence:
     evidence: str  # Base64 encoded attestation
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SignedTimeAnchor:
     """Signed timestamp anchor from trusted time source."""
     
@@ -203,7 +266,7 @@ class SignedTimeAnchor:
     kid: str  # Key ID for rotation
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PolicyDefinition:
     """Definition of a TECP policy."""
     
@@ -0,0 +1,46 @@
+"""
+TECP Utilities for Python SDK
+
+Key generation and receipt size helpers.
+"""
+
+import json
+from typing import Dict, Tuple
+
+import cbor2
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+from .types import Receipt
+
+
+# Receipts should stay well under this size on the wire
+MAX_RECEIPT_SIZE_BYTES = 8192  # 8KB
+
+
+def generate_keypair() -> Tuple[Ed25519PrivateKey, Ed25519PublicKey]:
+    """
+    Generate a new Ed25519 signing key pair.
+    
+    Returns:
+        Tuple of (private_key, public_key)
+    """
+    private_key = Ed25519PrivateKey.generate()
+    return private_key, private_key.public_key()
+
+
+def calculate_receipt_size(receipt: Receipt) -> Dict[str, int]:
+    """
+    Calculate a receipt's encoded size for performance monitoring.
+    
+    Args:
+        receipt: Receipt to measure
+        
+    Returns:
+        JSON and CBOR sizes in bytes, and the size target
+    """
+    data = receipt.to_dict()
+    return {
+        "json_bytes": len(json.dumps(data, separators=(",", ":")).encode("utf-8")),
+        "cbor_bytes": len(cbor2.dumps(data)),
+        "target_max": MAX_RECEIPT_SIZE_BYTES,
+    }
@@ -0,0 +1,313 @@
+"""
+Tests for TECPClient receipt creation and verification.
+
+Fixed vectors are shared with tecp-py (spec/test-vectors/valid/
+receipt-versions.json), so the SDK must reproduce the same preimage and
+signature for every receipt version and hash algorithm.
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import os
+import random
+from pathlib import Path
+
+import cbor2
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from tecp_sdk import TECPClient, Receipt, TECPError
+from tecp_sdk import client as client_module
+from tecp_sdk.types import ErrorCode
+
+
+VECTORS_PATH = Path(__file__).resolve().parents[3] / "spec" / "test-vectors" / "valid" / "receipt-versions.json"
+VECTORS = json.loads(VECTORS_PATH.read_text())["vectors"]
+
+
+def _vector_params():
+    params = []
+    for vector in VECTORS:
+        marks = []
+        if vector["test_data"]["hash_alg"] not in client_module._HASHERS:
+            marks.append(pytest.mark.skip(reason=f"{vector['test_data']['hash_alg']} not installed"))
+        params.append(pytest.param(vector, id=vector["name"], marks=marks))
+    return params
+
+
+@pytest.fixture
+def client():
+    return TECPClient(private_key=Ed25519PrivateKey.from_private_bytes(bytes(range(32))))
+
+
+@pytest.fixture
+def freeze_time(monkeypatch):
+    """Pin the client's clock to a given Unix millisecond timestamp."""
+    def freeze(ts_ms: int):
+        monkeypatch.setattr(client_module, "_now_ms", lambda: ts_ms)
+    return freeze
+
+
+@pytest.mark.parametrize("vector", _vector_params())
+def test_vector_signing(vector, freeze_time, monkeypatch):
+    test_data = vector["test_data"]
+    freeze_time(test_data["timestamp"])
+    monkeypatch.setattr(client_module._nonce_source, "next", lambda: base64.b64decode(test_data["nonce"]))
+    client = TECPClient(
+        private_key=Ed25519PrivateKey.from_private_bytes(bytes.fromhex(test_data["private_key"])),
+        raw_preimage=test_data["raw_preimage"],
+        hash_alg=test_data["hash_alg"],
+    )
+    receipt = client.create_receipt_sync(
+        test_data["input_data"], test_data["output_data"], test_data["policy_ids"], test_data["code_ref"]
+    )
+    expected = vector["expected_receipt"]
+    assert {name: getattr(receipt, name) for name in expected} == expected
+    assert client._receipt_preimage(receipt).hex() == vector["cbor_bytes"]
+
+
+@pytest.mark.parametrize("vector", _vector_params())
+def test_vector_verification(vector, client, freeze_time):
+    receipt = Receipt.from_dict(vector["expected_receipt"])
+    freeze_time(receipt.ts)
+    result = client.verify_receipt_sync(receipt)
+    assert result.valid, result.errors
+    assert client._receipt_preimage(receipt).hex() == vector["cbor_bytes"]
+
+    receipt.policy_ids = receipt.policy_ids[:1]
+    assert not client.verify_receipt_sync(receipt).valid
+
+
+_ALPHABET = "abcXYZ019+/=_-:. éß€漢\U0001F600"
+
+
+def _text(rng: random.Random) -> str:
+    n = rng.choice([0, 1, 23, 24, 255, 256, rng.randint(0, 300)])
+    return "".join(rng.choice(_ALPHABET) for _ in range(n))
+
+
+def _signing_map(rng: random.Random, raw: bool, hash_alg: bool) -> dict:
+    binary = (lambda: os.urandom(rng.choice([0, 16, 24, 32, 256]))) if raw else (lambda: _text(rng))
+    fields = {
+        "ts": rng.choice([0, 23, 24, 256, 2**32, 1692115200000, 2**64 - 1, -1, -25, -2**64, rng.randint(-2**63, 2**63)]),
+        "nonce": binary(),
+        "pubkey": binary(),
+        "version": _text(rng),
+        "code_ref": _text(rng),
+        "input_hash": binary(),
+        "policy_ids": [_text(rng) for _ in range(rng.choice([0, 1, 23, 24, 30]))],
+        "output_hash": binary(),
+    }
+    if hash_alg:
+        fields["hash_alg"] = _text(rng)
+    return fields
+
+
+@pytest.mark.parametrize("raw", [False, True])
+@pytest.mark.parametrize("hash_alg", [False, True])
+def test_preimage_template_matches_cbor2_canonical(raw, hash_alg):
+    rng = random.Random(f"{raw}-{hash_alg}")
+    for _ in range(500):
+        fields = _signing_map(rng, raw, hash_alg)
+        values = [fields[name] for name in client_module._SIGNING_FIELDS]
+        expected = cbor2.dumps(fields, canonical=True)
+        assert client_module._encode_receipt_preimage_fast(*values, fields.get("hash_alg")) == expected, fields
+
+
+@pytest.mark.parametrize("value", [1.5, True, None, 2**64, -2**64 - 1])
+def test_preimage_template_falls_back_off_schema(client, value):
+    values = [0, "n", "p", "v", "c", "i", ["a"], "o"]
+    values[0] = value
+    assert client_module._encode_receipt_preimage_fast(*values) is None
+    fields = dict(zip(client_module._SIGNING_FIELDS, values))
+    assert client._canonical_cbor_receipt(values) == cbor2.dumps(fields, canonical=True)
+
+
+@pytest.mark.parametrize("raw", [False, True])
+@pytest.mark.parametrize("hash_alg", [False, True])
+def test_libipld_backend_matches_cbor2_canonical(client, monkeypatch, raw, hash_alg):
+    libipld = pytest.importorskip("libipld")
+    monkeypatch.setattr(client_module, "_encode_dag_cbor", libipld.encode_dag_cbor)
+    rng = random.Random(f"ipld-{raw}-{hash_alg}")
+    for _ in range(500):
+        fields = _signing_map(rng, raw, hash_alg)
+        if not -2**63 <= fields["ts"] < 2**64:
+            continue  # outside DAG-CBOR's integer range
+        values = [fields[name] for name in client_module._SIGNING_FIELDS]
+        expected = cbor2.dumps(fields, canonical=True)
+        assert client._canonical_cbor_receipt(values, fields.get("hash_alg")) == expected, fields
+
+
+def test_libipld_backend_never_emits_cid_links(client, monkeypatch):
+    libipld = pytest.importorskip("libipld")
+    monkeypatch.setattr(client_module, "_encode_dag_cbor", libipld.encode_dag_cbor)
+    # A CIDv1 (raw codec, identity multihash): libipld would encode it as a
+    # tag-42 link rather than a byte string
+    cid_like = bytes.fromhex("0155001e") + bytes(30)
+    assert libipld.encode_dag_cbor(cid_like)[:2] == b"\xd8\x2a"
+    values = [1, os.urandom(16), os.urandom(32), "TECP-0.2", "git:abc", cid_like, ["p"], os.urandom(32)]
+    expected = cbor2.dumps(dict(zip(client_module._SIGNING_FIELDS, values)), canonical=True)
+    assert client._canonical_cbor_receipt(values) == expected
+
+
+@pytest.mark.parametrize("hash_alg", ["sha256", "blake2b"])
+@pytest.mark.parametrize("raw", [False, True])
+def test_create_and_verify(hash_alg, raw):
+    client = TECPClient(
+        private_key=Ed25519PrivateKey.from_private_bytes(bytes(range(32))), raw_preimage=raw, hash_alg=hash_alg
+    )
+    receipt = asyncio.run(client.create_receipt("input", b"output", policies=["no_retention"]))
+    assert receipt.input_hash == base64.b64encode(client_module._HASHERS[hash_alg](b"input").digest()).decode()
+    assert asyncio.run(client.verify_receipt(receipt)).valid
+    assert client.verify_receipt_sync(receipt).valid
+
+
+def test_create_without_private_key():
+    with pytest.raises(TECPError):
+        TECPClient().create_receipt_sync("in", "out")
+
+
+def test_verify_without_private_key(client):
+    receipt = client.create_receipt_sync("in", "out")
+    assert TECPClient().verify_receipt_sync(receipt).valid
+
+
+def test_json_round_trip(client):
+    receipt = client.create_receipt_sync("in", "out", policies=["no_retention", "eu_region"])
+    restored = Receipt.from_json(receipt.to_json())
+    assert restored == receipt
+    assert client.verify_receipt_sync(restored).valid
+
+
+@pytest.mark.parametrize("field", ["ts", "nonce", "input_hash", "output_hash", "policy_ids", "code_ref", "pubkey"])
+def test_tampering_fails(client, field):
+    receipt = client.create_receipt_sync("in", "out", policies=["no_retention"])
+    assert client.verify_receipt_sync(receipt).valid
+    if field == "ts":
+        receipt.ts -= 1
+    elif field == "policy_ids":
+        receipt.policy_ids.append("extra")  # in place, after the preimage was cached
+    elif field == "code_ref":
+        receipt.code_ref += "x"
+    elif field == "pubkey":
+        other = Ed25519PrivateKey.from_private_bytes(bytes(32)).public_key()
+        receipt.pubkey = client._b64encode(other.public_bytes_raw())
+    else:
+        setattr(receipt, field, client._b64encode(hashlib.sha256(getattr(receipt, field).encode()).digest()[:16 if field == "nonce" else 32]))
+    result = client.verify_receipt_sync(receipt)
+    assert not result.valid
+    assert result.has_error(ErrorCode.SIG_VERIFICATION_FAILED)
+
+
+@pytest.mark.parametrize("version, hash_alg, code", [
+    ("TECP-9.9", None, ErrorCode.SCHEMA_UNKNOWN_VERSION),
+    ("TECP-0.3", None, ErrorCode.SCHEMA_MISSING_FIELD),
+    ("TECP-0.4", None, ErrorCode.SCHEMA_MISSING_FIELD),
+    ("TECP-0.1", "blake2b", ErrorCode.SCHEMA_INVALID_FORMAT),
+    ("TECP-0.2", "blake2b", ErrorCode.SCHEMA_INVALID_FORMAT),
+    ("TECP-0.3", "md5", ErrorCode.SCHEMA_INVALID_FORMAT),
+])
+def test_version_and_hash_alg_must_agree(client, version, hash_alg, code):
+    receipt = client.create_receipt_sync("in", "out")
+    receipt.version = version
+    receipt.hash_alg = hash_alg
+    result = client.verify_receipt_sync(receipt)
+    assert not result.valid
+    assert result.has_error(code)
+    assert code.value in result.error_codes
+
+
+def test_error_context_holds_messages_only(client):
+    receipt = client.create_receipt_sync("in", "out")
+    receipt.sig = client._b64encode(bytes(64))
+    result = client.verify_receipt_sync(receipt)
+    assert not result.valid
+    assert all(type(arg) is str for args in result.error_context.values() for arg in args)
+    assert result.errors[0].startswith("Signature verification failed")
+
+
+SMALL_ORDER_POINTS = [
+    bytes(32),
+    b"\x01" + bytes(31),
+    bytes.fromhex("26e8958fc2b227b045c3f489f2ef98f0d5dfac05d3c63339b13802886d53fc05"),
+    bytes.fromhex("c7176a703d4dd84fba3c0b760d10670f2a2053fa2c39ccc64ec7fd7792ac037a"),
+    bytes.fromhex("ecffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff7f"),
+    (2**255 - 19 + 3).to_bytes(32, "little"),  # non-canonical y
+]
+
+
+@pytest.mark.parametrize("point", SMALL_ORDER_POINTS, ids=lambda p: p.hex()[:8])
+def test_weak_public_keys_are_rejected(client, point):
+    receipt = client.create_receipt_sync("in", "out")
+    receipt.pubkey = client._b64encode(point)
+    # With a small-order key and R, an all-zero scalar verifies under
+    # OpenSSL for any message
+    receipt.sig = client._b64encode(point + bytes(32))
+    result = client.verify_receipt_sync(receipt)
+    assert not result.valid
+    assert result.has_error(ErrorCode.SIG_VERIFICATION_FAILED)
+
+
+def test_verify_receipts_batch(client):
+    receipts = [client.create_receipt_sync(f"in{i}", "out") for i in range(5)]
+    receipts[1].output_hash = receipts[1].input_hash
+    receipts[3].ts += 10 * 24 * 60 * 60 * 1000
+    results = asyncio.run(client.verify_receipts_batch(receipts))
+    assert [r.valid for r in results] == [True, False, True, False, True]
+    assert [r.valid for r in results] == [client.verify_receipt_sync(r).valid for r in receipts]
+
+
+@pytest.mark.parametrize("profile, age_ms, valid", [
+    ("tecp-strict", 2 * 60 * 60 * 1000, False),
+    ("tecp-v0.1", 2 * 60 * 60 * 1000, True),
+    ("tecp-v0.1", 2 * 24 * 60 * 60 * 1000, False),
+    ("tecp-lite", 2 * 24 * 60 * 60 * 1000, True),
+])
+def test_profile_age_limits(freeze_time, profile, age_ms, valid):
+    client = TECPClient(private_key=Ed25519PrivateKey.from_private_bytes(bytes(range(32))), profile=profile)
+    receipt = client.create_receipt_sync("in", "out")
+    freeze_time(receipt.ts + age_ms)
+    result = client.verify_receipt_sync(receipt)
+    assert result.valid is valid
+    if not valid:
+        assert result.has_error(ErrorCode.AGE_TOO_OLD)
+
+
+def test_strict_profile_requires_policies(client):
+    receipt = client.create_receipt_sync("in", "out")
+    receipt.policy_ids = []
+    result = client.verify_receipt_sync(receipt, profile="tecp-strict")
+    assert not result.valid
+    assert result.has_error(ErrorCode.POLICY_REQUIREMENTS_NOT_MET)
+
+
+def test_streams_hash_from_current_position(client):
+    payload = io.BytesIO(b"abcdef")
+    payload.seek(3)
+    receipt = client.create_receipt_sync(payload, b"out")
+    assert receipt.input_hash == client._b64encode(hashlib.sha256(b"def").digest())
+
+
+def test_file_inputs_are_streamed(client, tmp_path):
+    data = os.urandom(3 << 20)
+    path = tmp_path / "payload.bin"
+    path.write_bytes(data)
+    with open(path, "rb") as f:
+        from_file = client.create_receipt_sync(f, data[:10])
+    from_bytes = client.create_receipt_sync(data, data[:10])
+    assert from_file.input_hash == from_bytes.input_hash
+    assert from_file.output_hash == from_bytes.output_hash
+
+
+@pytest.mark.parametrize("size", [0, 10, 1 << 20, 3 << 20])
+def test_dual_digest(size):
+    a, b = b"x" * size, b"y" * (size + 5)
+    assert client_module._dual_digest(a, b) == (hashlib.sha256(a).digest(), hashlib.sha256(b).digest())
+
+
+def test_unsupported_hash_alg():
+    with pytest.raises(TECPError):
+        TECPClient(hash_alg="md5")
@@ -0,0 +1,93 @@
+"""
+Cross-verification between the SDK and the tecp reference package.
+
+Receipts created by either implementation must verify in the other for
+every receipt version and hash algorithm. Skipped when tecp is not
+installed.
+"""
+
+import asyncio
+import base64
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from tecp_sdk import TECPClient, Receipt
+from tecp_sdk import client as client_module
+
+tecp = pytest.importorskip("tecp")
+
+
+SEED = bytes(range(32))
+LAYOUTS = [
+    pytest.param(
+        hash_alg, raw,
+        id=f"{hash_alg}-{'raw' if raw else 'b64'}",
+        marks=[] if hash_alg in client_module._HASHERS else [pytest.mark.skip(reason=f"{hash_alg} not installed")],
+    )
+    for hash_alg in ("sha256", "blake2b", "blake3")
+    for raw in (False, True)
+]
+
+
+def _reference_signer(hash_alg: str, raw: bool):
+    public_key = Ed25519PrivateKey.from_private_bytes(SEED).public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+    return tecp.ReceiptSigner(SEED, public_key, hash_alg=hash_alg, raw_preimage=raw)
+
+
+def _client(hash_alg: str, raw: bool) -> TECPClient:
+    return TECPClient(private_key=Ed25519PrivateKey.from_private_bytes(SEED), raw_preimage=raw, hash_alg=hash_alg)
+
+
+@pytest.mark.parametrize("hash_alg, raw", LAYOUTS)
+def test_sdk_receipts_verify_in_tecp(hash_alg, raw):
+    receipt = _client(hash_alg, raw).create_receipt_sync(
+        "sensitive data", b"processed result", policies=["no_retention", "eu_region"], code_ref="git:abc"
+    )
+    data = receipt.to_dict()
+    data.pop("environment")  # SDK metadata, not part of tecp's schema
+    result = tecp.ReceiptVerifier().verify(data)
+    assert result.valid, result.errors
+
+    data["output_hash"] = data["input_hash"]
+    assert not tecp.ReceiptVerifier().verify(data).valid
+
+
+@pytest.mark.parametrize("hash_alg, raw", LAYOUTS)
+def test_tecp_receipts_verify_in_sdk(hash_alg, raw):
+    signer = _reference_signer(hash_alg, raw)
+    data = signer.create_receipt("git:abc", b"sensitive data", b"processed result", ["no_retention"])
+    receipt = Receipt.from_dict(data.model_dump(exclude_none=True))
+    client = TECPClient()
+    result = client.verify_receipt_sync(receipt)
+    assert result.valid, result.errors
+
+    receipt.code_ref = "git:def"
+    assert not client.verify_receipt_sync(receipt).valid
+
+
+@pytest.mark.parametrize("hash_alg, raw", LAYOUTS)
+def test_same_inputs_same_signature(hash_alg, raw, monkeypatch):
+    ts, nonce = 1692115200000, base64.b64encode(bytes(16)).decode()
+    monkeypatch.setattr(client_module, "_now_ms", lambda: ts)
+    monkeypatch.setattr(client_module._nonce_source, "next", lambda: bytes(16))
+    sdk = _client(hash_alg, raw).create_receipt_sync("in", "out", policies=["p"], code_ref="git:abc")
+    reference = _reference_signer(hash_alg, raw).create_receipt(
+        "git:abc", b"in", b"out", ["p"], timestamp=ts, nonce=nonce
+    )
+    assert (sdk.version, sdk.input_hash, sdk.output_hash, sdk.sig) == (
+        reference.version, reference.input_hash, reference.output_hash, reference.sig
+    )
+
+
+def test_batch_receipts_verify_in_sdk():
+    from tecp.types import CreateReceiptParams
+
+    signer = _reference_signer("sha256", False)
+    receipts = signer.create_receipts([
+        CreateReceiptParams(code_ref="git:abc", input_data=b"in%d" % i, output_data=b"out", policy_ids=["p"])
+        for i in range(10)
+    ])
+    results = asyncio.run(TECPClient().verify_receipts_batch([Receipt.from_dict(r) for r in receipts]))
+    assert [r.valid for r in results] == [True] * 10